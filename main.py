@@ -4,9 +4,9 @@
 # Version estable 2025-11
 # ======================================================
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Depends, Header
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 import os, traceback, asyncio
 from io import BytesIO
@@ -18,20 +18,23 @@ import hmac
 import hashlib
 import time
 import uvloop
-import nest_asyncio
 from pypdf import PdfReader
 
+# msgspec es opcional: si no está instalado se mantiene la serialización clásica de FastAPI
+try:
+    import msgspec
+except Exception:
+    msgspec = None
+
 # ============================================
 # Compatibilidad con entorno Render (modo sandbox)
 # ============================================
 try:
-    import nest_asyncio
-    nest_asyncio.apply()
     import uvloop
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-    print("âœ… Modo Render seguro activado (nest_asyncio + uvloop)")
+    print("âœ… uvloop activado como event loop policy")
 except Exception as e:
-    print(f"âš ï¸ No se aplicÃ³ uvloop/nest_asyncio: {e}")
+    print(f"âš ï¸ No se aplicÃ³ uvloop: {e}")
 
 # ============================================
 # Importacion de conectores
@@ -39,6 +42,7 @@ except Exception as e:
 try:
     from providers.fielweb_connector import (
         consultar_fielweb,
+        consultar_fielweb_batch,
         descargar_norma_archivo,
     )
     from providers.judicial_connectors import (
@@ -57,6 +61,7 @@ try:
     print("Conectores cargados correctamente.")
 except ModuleNotFoundError as e:
     consultar_fielweb = None
+    consultar_fielweb_batch = None
     descargar_norma_archivo = None
     consultar_jurisprudencia = None
     consultar_corte_nacional = None
@@ -77,6 +82,18 @@ except ModuleNotFoundError as e:
 app = FastAPI(title="H&G Abogados IA - Robot Juri­dico Inteligente")
 DOWNLOAD_TOKEN_SECRET = os.getenv("DOWNLOAD_TOKEN_SECRET", "").strip()
 
+# Clave de API opcional: si API_KEY esta vacia el servicio queda abierto
+# (comportamiento historico). Se valida como dependencia por ruta en lugar
+# de middleware global, asi /, /health y rutas no enrutadas no pagan el costo.
+_API_KEY_B = os.getenv("API_KEY", "").strip().encode("utf-8")
+
+
+async def require_key(x_api_key: Optional[str] = Header(None)):
+    if not _API_KEY_B:
+        return
+    if not hmac.compare_digest((x_api_key or "").encode("utf-8"), _API_KEY_B):
+        raise HTTPException(status_code=401, detail="X-API-Key invalida o ausente.")
+
 
 class ConsultarFielwebRequest(BaseModel):
     texto: str = Field(..., description="Termino de busqueda.")
@@ -101,6 +118,14 @@ class ConsultarFielwebRequest(BaseModel):
         allow_population_by_field_name = True
 
 
+if msgspec is not None:
+    def _json_bytes(obj: Any) -> bytes:
+        return msgspec.json.encode(obj)
+else:
+    def _json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 class DocumentAnalyzeRequest(BaseModel):
     """
     Solicita la lectura y extraccion de texto de un PDF.
@@ -195,18 +220,30 @@ def _build_snippets(text: str, query: str, max_snippets: int = 3, window: int =
 # ============================================
 # Endpoints basicos
 # ============================================
+# Respuestas precomputadas: los probes de LB/K8s golpean estas rutas cada
+# pocos segundos; bytes inmutables evitan dict + encode + Response por request.
+_ROOT_RESP = Response(
+    content=b'{"message":"Servicio activo: H&G Abogados IA"}',
+    media_type="application/json",
+)
+_HEALTH_RESP = Response(
+    content=b'{"status":"ok","service":"H&G Abogados IA"}',
+    media_type="application/json",
+)
+
+
 @app.get("/")
 async def root():
-    return {"message": "Servicio activo: H&G Abogados IA"}
+    return _ROOT_RESP
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "service": "H&G Abogados IA"}
+    return _HEALTH_RESP
 
 # ============================================
 # Consultas FielWeb
 # ============================================
-@app.post("/consult_real_fielweb")
+@app.post("/consult_real_fielweb", dependencies=[Depends(require_key)])
 async def consult_fielweb_endpoint(payload: ConsultarFielwebRequest):
     if not consultar_fielweb:
         raise HTTPException(status_code=500, detail="Conector FielWeb no disponible.")
@@ -220,9 +257,19 @@ async def consult_fielweb_endpoint(payload: ConsultarFielwebRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error FielWeb: {str(e)}")
 
+@app.post("/consult_fielweb_batch", dependencies=[Depends(require_key)])
+async def consult_fielweb_batch_endpoint(payload: dict):
+    if not consultar_fielweb_batch:
+        raise HTTPException(status_code=500, detail="Conector FielWeb no disponible.")
+    try:
+        return await run_in_threadpool(consultar_fielweb_batch, payload)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error FielWeb: {str(e)}")
+
 
 
-@app.post("/fielweb/download_link")
+@app.post("/fielweb/download_link", dependencies=[Depends(require_key)])
 async def fielweb_download_link(payload: dict, request: Request):
     norma_id = payload.get("norma_id")
     if norma_id is None:
@@ -300,7 +347,7 @@ async def fielweb_download(token: str):
     return Response(content=result["content_bytes"], media_type=content_type, headers=headers)
 
 
-@app.post("/document/analyze")
+@app.post("/document/analyze", dependencies=[Depends(require_key)])
 async def document_analyze(payload: DocumentAnalyzeRequest):
     """
     Descarga un PDF y extrae texto completo para analisis.
@@ -390,7 +437,7 @@ async def document_analyze(payload: DocumentAnalyzeRequest):
 # ============================================
 # Exportar PDF SATJE (procesos judiciales)
 # ============================================
-@app.post("/satje/export_pdf_link")
+@app.post("/satje/export_pdf_link", dependencies=[Depends(require_key)])
 async def satje_export_pdf_link(payload: dict, request: Request):
     id_juicio = payload.get("id_juicio") or payload.get("idJuicio") or payload.get("numero_causa")
     if not id_juicio:
@@ -459,7 +506,7 @@ async def satje_export_pdf(token: str):
 # ============================================
 # Consultas Jurisprudenciales
 # ============================================
-@app.post("/consult_real_jurisprudencia")
+@app.post("/consult_real_jurisprudencia", dependencies=[Depends(require_key)])
 async def consult_jurisprudencia_endpoint(payload: dict):
     if not consultar_jurisprudencia:
         raise HTTPException(status_code=500, detail="Conector de Jurisprudencia no disponible.")
@@ -472,7 +519,7 @@ async def consult_jurisprudencia_endpoint(payload: dict):
 # ============================================
 # Consulta individual Corte Nacional (nuevo buscador)
 # ============================================
-@app.post("/consult_corte_nacional")
+@app.post("/consult_corte_nacional", dependencies=[Depends(require_key)])
 async def consult_corte_nacional_endpoint(payload: dict):
     if not consultar_corte_nacional:
         raise HTTPException(status_code=500, detail="Conector Corte Nacional no disponible.")
@@ -485,7 +532,7 @@ async def consult_corte_nacional_endpoint(payload: dict):
 # ============================================
 # Consulta individual Procesos Judiciales (E-SATJE)
 # ============================================
-@app.post("/consult_procesos_judiciales")
+@app.post("/consult_procesos_judiciales", dependencies=[Depends(require_key)])
 async def consult_procesos_judiciales_endpoint(payload: dict):
     if not consultar_procesos_judiciales:
         raise HTTPException(status_code=500, detail="Conector Procesos Judiciales no disponible.")
@@ -498,7 +545,7 @@ async def consult_procesos_judiciales_endpoint(payload: dict):
 # ============================================
 # Consulta Procesos Judiciales - Búsqueda avanzada (API)
 # ============================================
-@app.post("/consult_procesos_avanzada")
+@app.post("/consult_procesos_avanzada", dependencies=[Depends(require_key)])
 async def consult_procesos_avanzada_endpoint(payload: dict):
     if not consultar_procesos_avanzada:
         raise HTTPException(status_code=500, detail="Conector Procesos Judiciales (avanzada) no disponible.")
@@ -511,7 +558,7 @@ async def consult_procesos_avanzada_endpoint(payload: dict):
 # ============================================
 # Consulta Procesos resueltos por juez
 # ============================================
-@app.post("/consult_procesos_resueltos")
+@app.post("/consult_procesos_resueltos", dependencies=[Depends(require_key)])
 async def consult_procesos_resueltos_endpoint(payload: dict):
     if not consultar_procesos_resueltos:
         raise HTTPException(status_code=500, detail="Conector Procesos resueltos no disponible.")
@@ -524,7 +571,7 @@ async def consult_procesos_resueltos_endpoint(payload: dict):
 # ============================================
 # Consulta Superintendencia de Compañias (compañias)
 # ============================================
-@app.post("/consult_supercias_companias")
+@app.post("/consult_supercias_companias", dependencies=[Depends(require_key)])
 async def consult_supercias_companias_endpoint(payload: dict):
     if not consultar_supercias_companias:
         raise HTTPException(status_code=500, detail="Conector Supercias no disponible.")
@@ -538,7 +585,7 @@ async def consult_supercias_companias_endpoint(payload: dict):
 # ============================================
 # Consulta Juriscopio
 # ============================================
-@app.post("/consult_juriscopio")
+@app.post("/consult_juriscopio", dependencies=[Depends(require_key)])
 async def consult_juriscopio_endpoint(payload: dict):
     if not consultar_juriscopio:
         raise HTTPException(status_code=500, detail="Conector Juriscopio no disponible.")
@@ -549,7 +596,7 @@ async def consult_juriscopio_endpoint(payload: dict):
         raise HTTPException(status_code=500, detail=f"Error Juriscopio: {str(e)}")
 
 # Buscador de Sorteos (Corte Constitucional)
-@app.post("/consult_sorteos")
+@app.post("/consult_sorteos", dependencies=[Depends(require_key)])
 async def consult_sorteos_endpoint(payload: dict):
     if not consultar_sorteos:
         raise HTTPException(status_code=500, detail="Conector Sorteos no disponible.")
@@ -561,7 +608,7 @@ async def consult_sorteos_endpoint(payload: dict):
 
 # Consulta UAFE (sujetos obligados)
 # ============================================
-@app.post("/consult_real_uafe")
+@app.post("/consult_real_uafe", dependencies=[Depends(require_key)])
 async def consult_uafe_endpoint(payload: dict):
     if not consultar_uafe:
         return JSONResponse(
@@ -580,7 +627,7 @@ async def consult_uafe_endpoint(payload: dict):
 # ============================================
 # Consulta SPDP
 # ============================================
-@app.post("/consult_spdp")
+@app.post("/consult_spdp", dependencies=[Depends(require_key)])
 async def consult_spdp_endpoint(payload: dict):
     if not consultar_spdp:
         return JSONResponse(
@@ -599,35 +646,103 @@ async def consult_spdp_endpoint(payload: dict):
 # ============================================
 # Flujo Hibrido (Normativa + Jurisprudencia)
 # ============================================
-@app.post("/consult_hybrid")
+async def _hybrid_stream(texto: str, tipo: str, payload: dict):
+    """
+    Genera la respuesta hibrida de forma incremental: cada fuente se emite
+    apenas termina su scraper, sin retener el dict completo en memoria.
+    """
+    fuentes = {
+        "normativa_y_concordancias": ("FielWeb", consultar_fielweb),
+        "jurisprudencia_y_sentencias": ("Jurisprudencia", consultar_jurisprudencia),
+    }
+
+    async def _consultar(clave: str, nombre: str, fn):
+        try:
+            return clave, nombre, await run_in_threadpool(fn, payload)
+        except Exception:
+            traceback.print_exc()
+            return clave, nombre, None
+
+    tareas = [
+        asyncio.ensure_future(_consultar(clave, nombre, fn))
+        for clave, (nombre, fn) in fuentes.items()
+        if fn
+    ]
+
+    yield (
+        b'{"status":"ok","mensaje":"Consulta hibrida completada con exito",'
+        b'"texto_consultado":' + _json_bytes(texto) +
+        b',"tipo_usuario":' + _json_bytes(tipo) +
+        b',"resultado":{'
+    )
+
+    consultadas: Dict[str, bool] = {nombre: False for nombre, _ in fuentes.values()}
+    emitidos = 0
+    for terminada in asyncio.as_completed(tareas):
+        clave, nombre, resultado = await terminada
+        consultadas[nombre] = bool(resultado)
+        items = (resultado or {}).get("resultado") or []
+        prefijo = b"" if emitidos == 0 else b","
+        yield prefijo + _json_bytes(clave) + b":" + _json_bytes(items)
+        emitidos += 1
+
+    # Fuentes sin conector disponible se emiten vacias para conservar la forma
+    for clave, (nombre, fn) in fuentes.items():
+        if not fn:
+            prefijo = b"" if emitidos == 0 else b","
+            yield prefijo + _json_bytes(clave) + b":[]"
+            emitidos += 1
+
+    yield b'},"fuentes_consultadas":' + _json_bytes(consultadas) + b"}"
+
+
+# Mapa single-flight: peticiones hibridas identicas en vuelo comparten una
+# sola ejecucion de los scrapers; las duplicadas esperan el mismo Future.
+_HYBRID_INFLIGHT: Dict[str, asyncio.Future] = {}
+
+
+@app.post("/consult_hybrid", dependencies=[Depends(require_key)])
 async def consult_hybrid(payload: dict):
     texto = payload.get("texto", "")
     tipo = payload.get("tipo_usuario", "")
 
     try:
-        resultado_fielweb = await run_in_threadpool(consultar_fielweb, payload) if consultar_fielweb else None
-        resultado_juris = await run_in_threadpool(consultar_jurisprudencia, payload) if consultar_jurisprudencia else None
+        clave = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    except Exception:
+        clave = f"{texto}|{tipo}"
 
-        combinado = {
-            "normativa_y_concordancias": resultado_fielweb.get("resultado") if resultado_fielweb else [],
-            "jurisprudencia_y_sentencias": resultado_juris.get("resultado") if resultado_juris else []
-        }
+    fut = _HYBRID_INFLIGHT.get(clave)
+    if fut is not None:
+        try:
+            cuerpo = await asyncio.shield(fut)
+            return Response(content=cuerpo, media_type="application/json")
+        except Exception:
+            # Si el lider fallo o se desconecto, esta peticion consulta por su cuenta
+            return StreamingResponse(_hybrid_stream(texto, tipo, payload), media_type="application/json")
 
-        return {
-            "status": "ok",
-            "mensaje": "Consulta hÃ­brida completada con Ã©xito",
-            "texto_consultado": texto,
-            "tipo_usuario": tipo,
-            "fuentes_consultadas": {
-                "FielWeb": bool(resultado_fielweb),
-                "Jurisprudencia": bool(resultado_juris)
-            },
-            "resultado": combinado
-        }
+    fut = asyncio.get_event_loop().create_future()
+    # Consumir la excepcion si ningun duplicado llego a esperar el Future
+    fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _HYBRID_INFLIGHT[clave] = fut
 
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error hÃ­brido: {str(e)}")
+    async def _stream_y_compartir():
+        trozos: List[bytes] = []
+        try:
+            async for trozo in _hybrid_stream(texto, tipo, payload):
+                trozos.append(trozo)
+                yield trozo
+            if not fut.done():
+                fut.set_result(b"".join(trozos))
+        except BaseException as exc:
+            if not fut.done():
+                fut.set_exception(RuntimeError(f"Consulta hibrida interrumpida: {exc}"))
+            raise
+        finally:
+            _HYBRID_INFLIGHT.pop(clave, None)
+            if not fut.done():
+                fut.set_exception(RuntimeError("Consulta hibrida interrumpida."))
+
+    return StreamingResponse(_stream_y_compartir(), media_type="application/json")
 
 # ============================================
 # Pre-busqueda global (resumen por fuente)
@@ -653,7 +768,7 @@ def _min_generic_item(item: Dict[str, Any], fuente: str) -> Dict[str, Any]:
     }
 
 
-@app.post("/consult_global")
+@app.post("/consult_global", dependencies=[Depends(require_key)])
 async def consult_global(payload: dict):
     texto = (payload.get("texto") or payload.get("consulta") or payload.get("query") or "").strip()
     if not texto:
@@ -882,7 +997,7 @@ async def check_uafe_status():
             status_code=200
         )
 
-@app.get("/check_fielweb_status")
+@app.get("/check_fielweb_status", dependencies=[Depends(require_key)])
 async def check_fielweb_status():
     """
     Verifica la configuracion completa del entorno FielWeb y Render.
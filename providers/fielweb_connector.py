@@ -15,10 +15,32 @@ endpoint para usos posteriores.
 """
 
 import os
+import io
+import sys
 import base64
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
 import requests
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin, parse_qs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+# Parser JSON en C (opcional): notablemente mas rapido en payloads grandes
+try:
+    import orjson
+
+    def _json_loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+except Exception:
+    import json as _json_std
+
+    def _json_loads(raw: bytes) -> Any:
+        return _json_std.loads(raw)
 
 FIELWEB_BASE = os.getenv("FIELWEB_BASE_URL", "https://www.fielweb.com").rstrip("/")
 FIELWEB_LOGIN_URL = os.getenv("FIELWEB_LOGIN_URL", f"{FIELWEB_BASE}/Cuenta/Login.aspx")
@@ -29,8 +51,35 @@ DEFAULT_REFORMAS = "2"  # pestaña "Todo" en el front
 DEFAULT_SECCION = 1     # s=1 observado en búsquedas
 DEFAULT_PAGE = 1
 
+# URLs absolutas precalculadas: evitan el urljoin por request en _post_json
+_URL_SIGNIN = f"{FIELWEB_BASE}/Cuenta/login.aspx/signin"
+_URL_ACEPTO_TERMINOS = f"{FIELWEB_BASE}/Cuenta/login.aspx/aceptoTerminosCondiciones"
+_URL_TRAER_USUARIO = f"{FIELWEB_BASE}/app/main.aspx/traerUsuario"
+_URL_BUSCAR = f"{FIELWEB_BASE}/app/tpl/buscador/busquedas.aspx/buscar"
+_URL_DETALLE_NORMA = f"{FIELWEB_BASE}/app/tpl/norma/norma.aspx/traerDetalleNorma"
+_URL_PARTE_NORMA = f"{FIELWEB_BASE}/app/tpl/norma/norma.aspx/traerParteNorma"
+
+# Mapas constantes (solo lectura): construidos una vez en el import
+_GENERAR_ENDPOINTS = MappingProxyType(
+    {
+        "pdf": f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx/generarPDF",
+        "word": f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx/generarDOC",
+        "html": f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx/generarHTML",
+    }
+)
+_TIPO_ARCHIVO_MAP = MappingProxyType({"pdf": "1", "word": "2", "html": "3"})
+
+# Referencia local: ahorra el LOAD_ATTR sobre el modulo en los caminos
+# donde el b64 de payloads de varios MB ya es el costo dominante.
+_b64encode = base64.b64encode
 
-def _session() -> requests.Session:
+# Constantes por fila del mapeo de resultados: el endpoint de descarga y la
+# URL del visor de norma no cambian, se formatean desde plantillas fijas.
+_DOWNLOAD_ENDPOINT = _GENERAR_ENDPOINTS["pdf"]
+_INDEX_URL_TEMPLATE = FIELWEB_BASE + "/Index.aspx?nid={nid}#norma/{nid}"
+
+
+def _build_session() -> requests.Session:
     s = requests.Session()
     s.headers.update(
         {
@@ -42,76 +91,243 @@ def _session() -> requests.Session:
             "X-Requested-With": "XMLHttpRequest",
         }
     )
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv("FIELWEB_POOL_CONNECTIONS", "10")),
+        pool_maxsize=int(os.getenv("FIELWEB_POOL_MAXSIZE", "20")),
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 
+# Sesion compartida a nivel de modulo: reutiliza conexiones keep-alive de
+# urllib3 entre llamadas en lugar de pagar TCP+TLS en cada invocacion.
+_SESSION_LOCK = threading.Lock()
+_SHARED_SESSION: Optional[requests.Session] = None
+
+# Executor compartido para el fan-out de PDFs/descargas: evita crear y
+# destruir hilos en cada busqueda. Debe ser <= FIELWEB_POOL_MAXSIZE.
+_FANOUT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FIELWEB_FANOUT_WORKERS", "8")),
+    thread_name_prefix="fielweb-fanout",
+)
+
+
+def _session() -> requests.Session:
+    global _SHARED_SESSION
+    with _SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            _SHARED_SESSION = _build_session()
+        return _SHARED_SESSION
+
+
 def _post_json(sess: requests.Session, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    url = path if path.startswith("http") else urljoin(FIELWEB_BASE, path)
+    # Los paths relativos siempre empiezan con "/": concatenar basta, sin el
+    # doble urlsplit que hace urljoin
+    url = path if path.startswith("http") else FIELWEB_BASE + path
     resp = sess.post(url, json=payload, timeout=30)
     resp.raise_for_status()
     try:
-        data = resp.json()
-    except Exception:
-        raise RuntimeError(f"Respuesta no JSON desde {url}")
-    if not isinstance(data, dict):
+        data = _json_loads(resp.content)
+    except Exception as exc:
+        raise RuntimeError(f"Respuesta no JSON desde {url}") from exc
+    if type(data) is not dict:
         raise RuntimeError(f"Respuesta inesperada desde {url}")
     return data
 
 
 def _as_dict(value: Any) -> Dict[str, Any]:
-    if isinstance(value, dict):
+    # Camino rapido: en la practica el valor casi siempre ya es un dict
+    if type(value) is dict:
         return value
+    # Algunos campos "d"/"Data" llegan como JSON serializado dentro de un string
+    if type(value) is str and value[:1] == "{":
+        try:
+            parsed = _json_loads(value.encode("utf-8"))
+        except Exception:
+            return {}
+        return parsed if type(parsed) is dict else {}
     return {}
 
 
+def _d_data(resp: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+    """Extrae una sola vez el bloque d y su campo Data de una respuesta ASP.NET."""
+    d_block = _as_dict(resp.get("d"))
+    return d_block, d_block.get("Data")
+
+
 def _login_and_token(sess: requests.Session) -> str:
     if not FIELWEB_USERNAME or not FIELWEB_PASSWORD:
         raise RuntimeError("Faltan credenciales FIELWEB_USERNAME/FIELWEB_PASSWORD.")
 
-    # GET inicial para iniciar sesion ASP.NET y obtener cookies como ASP.NET_SessionId
-    try:
-        sess.get(FIELWEB_LOGIN_URL, timeout=20)
-    except Exception:
-        pass
+    # GET inicial para iniciar sesion ASP.NET y obtener cookies como
+    # ASP.NET_SessionId. Con la sesion compartida las cookies sobreviven entre
+    # logins, asi que el warmup solo hace falta la primera vez.
+    if "ASP.NET_SessionId" not in sess.cookies:
+        try:
+            sess.get(FIELWEB_LOGIN_URL, timeout=20)
+        except Exception:
+            pass
 
     signin_payload = {"u": FIELWEB_USERNAME, "c": FIELWEB_PASSWORD, "r": False, "aQS": False}
-    data = _post_json(sess, "/Cuenta/login.aspx/signin", signin_payload)
-    signin = _as_dict(data.get("d"))
-    signin_data = _as_dict(signin.get("Data"))
+    data = _post_json(sess, _URL_SIGNIN, signin_payload)
+    signin, signin_data = _d_data(data)
+    signin_data = _as_dict(signin_data)
     if not signin.get("Respuesta", True):
         raise RuntimeError(f"Login FielWeb falló: {data}")
 
-    _post_json(sess, "/Cuenta/login.aspx/aceptoTerminosCondiciones", {"u": FIELWEB_USERNAME})
-    usuario = _post_json(sess, "/app/main.aspx/traerUsuario", {})
-    usuario_data = _as_dict(usuario.get("d"))
-    usuario_data_block = _as_dict(usuario_data.get("Data"))
-    token = (
-        usuario_data_block.get("tk")
-        or usuario_data_block.get("token")
-        or signin_data.get("tk")
-        or signin_data.get("token")
-    )  # token de sesión
+    # Si el signin ya devolvio el token, el POST adicional a traerUsuario
+    # (un RTT completo) es innecesario.
+    token = signin_data.get("tk") or signin_data.get("token")
+    if token:
+        _post_json(sess, _URL_ACEPTO_TERMINOS, {"u": FIELWEB_USERNAME})
+        return token
+
+    # aceptoTerminos y traerUsuario solo dependen de la cookie de sesion del
+    # signin, no entre si: se solapan para pagar un RTT en vez de dos.
+    f_terminos = _FANOUT_EXECUTOR.submit(
+        _post_json, sess, _URL_ACEPTO_TERMINOS, {"u": FIELWEB_USERNAME}
+    )
+    usuario = _post_json(sess, _URL_TRAER_USUARIO, {})
+    f_terminos.result()
+    _, usuario_data_block = _d_data(usuario)
+    usuario_data_block = _as_dict(usuario_data_block)
+    token = usuario_data_block.get("tk") or usuario_data_block.get("token")  # token de sesión
     if not token:
         raise RuntimeError(f"No se obtuvo token desde traerUsuario: {usuario}")
     return token
 
 
+# Token de sesion cacheado: el login completo (signin + terminos + traerUsuario)
+# solo se repite cuando el token expira o se invalida tras un fallo de auth.
+_TOKEN_TTL = float(os.getenv("FIELWEB_TOKEN_TTL", "600"))
+_TOKEN_LOCK = threading.Lock()
+_CACHED_TOKEN: Optional[str] = None
+_TOKEN_EXPIRY = 0.0
+
+# Persistencia opcional de la sesion (token + cookies) en disco: un reinicio
+# del proceso reutiliza el login anterior mientras no haya expirado.
+_SESSION_PATH = os.getenv("FIELWEB_SESSION_PATH", "").strip()
+_SESSION_LOADED = False
+
+
+def _cargar_sesion_persistida(sess: requests.Session) -> None:
+    global _CACHED_TOKEN, _TOKEN_EXPIRY
+    if not _SESSION_PATH:
+        return
+    try:
+        with open(_SESSION_PATH, "rb") as fh:
+            estado = _json_loads(fh.read())
+    except Exception:
+        return
+    if type(estado) is not dict:
+        return
+    token = estado.get("token")
+    try:
+        expiry = float(estado.get("expiry") or 0.0)
+    except Exception:
+        expiry = 0.0
+    if not token or expiry <= time.time():
+        return
+    for nombre, valor in (estado.get("cookies") or {}).items():
+        sess.cookies.set(nombre, valor)
+    _CACHED_TOKEN = token
+    _TOKEN_EXPIRY = expiry
+
+
+def _persistir_sesion(sess: requests.Session) -> None:
+    if not _SESSION_PATH:
+        return
+    try:
+        estado = {
+            "token": _CACHED_TOKEN,
+            "expiry": _TOKEN_EXPIRY,
+            "cookies": requests.utils.dict_from_cookiejar(sess.cookies),
+        }
+        tmp = f"{_SESSION_PATH}.tmp.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(estado, fh)
+        os.replace(tmp, _SESSION_PATH)
+    except Exception:
+        pass
+
+
+def _ensure_token(sess: requests.Session) -> str:
+    global _CACHED_TOKEN, _TOKEN_EXPIRY, _SESSION_LOADED
+    now = time.time()
+    with _TOKEN_LOCK:
+        if not _SESSION_LOADED:
+            _SESSION_LOADED = True
+            _cargar_sesion_persistida(sess)
+        if _CACHED_TOKEN and _TOKEN_EXPIRY > now:
+            return _CACHED_TOKEN
+        token = _login_and_token(sess)
+        _CACHED_TOKEN = token
+        _TOKEN_EXPIRY = now + _TOKEN_TTL
+        _persistir_sesion(sess)
+        return token
+
+
+def _invalidate_token() -> None:
+    global _CACHED_TOKEN, _TOKEN_EXPIRY
+    with _TOKEN_LOCK:
+        _CACHED_TOKEN = None
+        _TOKEN_EXPIRY = 0.0
+        if _SESSION_PATH:
+            try:
+                os.remove(_SESSION_PATH)
+            except OSError:
+                pass
+
+
 def _build_ro_links(reg_img: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
     """Construye URL de visor RO a partir de registroOficialImagen.Url (&nav=...&tpag=...&pag=...)."""
     if not reg_img:
         return {"preview_url": None, "nav": None, "tpag": None, "pag": None}
 
+    # El Url solo trae nav/tpag/pag: un split manual evita el costo de parse_qs
     raw = (reg_img.get("Url") or "").lstrip("&")
-    qs = parse_qs(raw)
-    nav = qs.get("nav", [None])[0]
-    tpag = qs.get("tpag", [None])[0]
-    pag = qs.get("pag", [None])[0]
+    nav = tpag = pag = None
+    for par in raw.split("&"):
+        clave, sep, valor = par.partition("=")
+        if not sep:
+            continue
+        if "%" in valor or "+" in valor:
+            valor = unquote_plus(valor)
+        if clave == "nav":
+            nav = valor
+        elif clave == "tpag":
+            tpag = valor
+        elif clave == "pag":
+            pag = valor
+        if nav and tpag and pag:
+            break
     preview = None
     if nav and tpag and pag:
         preview = f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx?t=3&nav={nav}&tpag={tpag}&pag={pag}"
     return {"preview_url": preview, "nav": nav, "tpag": tpag, "pag": pag}
 
 
+# Cache opcional en disco de los PDF de RO, keyed por (nav, tpag, pag): el
+# primer query paga la descarga, los siguientes leen del filesystem. Se
+# activa definiendo FIELWEB_PDF_CACHE_DIR.
+_PDF_CACHE_DIR = os.getenv("FIELWEB_PDF_CACHE_DIR", "").strip()
+
+
+def _pdf_cache_path(nav: str, tpag: str, pag: str) -> str:
+    nombre = f"{nav}_{tpag}_{pag}".replace("/", "_").replace("\\", "_")
+    return os.path.join(_PDF_CACHE_DIR, f"{nombre}.pdf")
+
+
+def _pdf_from_bytes(pdf_bytes: bytes) -> Dict[str, Any]:
+    return {
+        "pdf_base64": _b64encode(pdf_bytes).decode("ascii"),
+        "pdf_size": len(pdf_bytes),
+        "pdf_sha256": hashlib.sha256(pdf_bytes).hexdigest(),
+    }
+
+
 def _download_pdf(
     sess: requests.Session,
     nav: Optional[str],
@@ -128,6 +344,15 @@ def _download_pdf(
     if not (nav and tpag and pag):
         return None
 
+    if _PDF_CACHE_DIR:
+        try:
+            with open(_pdf_cache_path(nav, tpag, pag), "rb") as fh:
+                return _pdf_from_bytes(fh.read())
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
+
     preview_url = f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx?t=3&nav={nav}&tpag={tpag}&pag={pag}"
     try:
         resp_view = sess.get(preview_url, timeout=30)
@@ -151,12 +376,32 @@ def _download_pdf(
             f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx/generarPDF",
             json=payload,
             timeout=60,
+            stream=True,
         )
         pdf_resp.raise_for_status()
-        pdf_bytes = pdf_resp.content
+        # Acumula por chunks en vez de materializar resp.content completo:
+        # reduce el pico de memoria en PDFs grandes y deja el hash calculado
+        # de paso para quien quiera cachear aguas abajo.
+        buf = io.BytesIO()
+        hasher = hashlib.sha256()
+        for chunk in pdf_resp.iter_content(65536):
+            buf.write(chunk)
+            hasher.update(chunk)
+        if _PDF_CACHE_DIR:
+            # Write-through atomico: tmp + os.replace para no servir parciales
+            try:
+                os.makedirs(_PDF_CACHE_DIR, exist_ok=True)
+                destino = _pdf_cache_path(nav, tpag, pag)
+                tmp = f"{destino}.tmp.{os.getpid()}"
+                with open(tmp, "wb") as fh:
+                    fh.write(buf.getbuffer())
+                os.replace(tmp, destino)
+            except Exception:
+                pass
         return {
-            "pdf_base64": base64.b64encode(pdf_bytes).decode("ascii"),
-            "pdf_size": len(pdf_bytes),
+            "pdf_base64": _b64encode(buf.getbuffer()).decode("ascii"),
+            "pdf_size": buf.getbuffer().nbytes,
+            "pdf_sha256": hasher.hexdigest(),
         }
     except Exception:
         return None
@@ -169,19 +414,14 @@ def _generar_doc(
     concordancias: bool,
     formato: str,
     include_content: bool = False,
+    raw_content: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """
     Genera ruta de descarga para PDF/Word/HTML usando los endpoints generarPDF/generarDOC/generarHTML.
     formato: "pdf" | "word" | "html"
     Retorna dict con ruta y url_iframe para descarga directa.
     """
-    endpoints = {
-        "pdf": "/app/tpl/visualizador/visualizador.aspx/generarPDF",
-        "word": "/app/tpl/visualizador/visualizador.aspx/generarDOC",
-        "html": "/app/tpl/visualizador/visualizador.aspx/generarHTML",
-    }
-    tipo_archivo_map = {"pdf": "1", "word": "2", "html": "3"}
-    ep = endpoints.get(formato.lower())
+    ep = _GENERAR_ENDPOINTS.get(formato.lower())
     if not ep:
         return None
     payload = {
@@ -196,23 +436,31 @@ def _generar_doc(
     }
     try:
         resp = _post_json(sess, ep, payload)
-        resp_d = _as_dict(resp.get("d"))
-        ruta = resp_d.get("Data")
+        _, ruta = _d_data(resp)
         if not ruta:
             return None
         ruta_enc = ruta.replace("\\", "\\\\")
         download_url = (
             f"{FIELWEB_BASE}/Clases/iFrameDescarga.aspx?"
-            f"ArchivoDescarga={ruta}&TipoArchivo={tipo_archivo_map[formato.lower()]}"
+            f"ArchivoDescarga={ruta}&TipoArchivo={_TIPO_ARCHIVO_MAP[formato.lower()]}"
         )
         resultado: Dict[str, Any] = {"ruta": ruta_enc, "download_url": download_url}
         if include_content:
             try:
                 headers = {"Referer": f"{FIELWEB_BASE}/Index.aspx?nid={norma_id}#norma/{norma_id}"}
-                archivo_resp = sess.get(download_url, headers=headers, timeout=60)
-                archivo_resp.raise_for_status()
-                resultado["archivo_base64"] = base64.b64encode(archivo_resp.content).decode("ascii")
-                resultado["content_type"] = archivo_resp.headers.get("Content-Type")
+                # Igual que en _download_pdf: lectura por chunks en vez de
+                # materializar resp.content completo antes de codificar.
+                with sess.get(download_url, headers=headers, timeout=60, stream=True) as archivo_resp:
+                    archivo_resp.raise_for_status()
+                    buf = io.BytesIO()
+                    for chunk in archivo_resp.iter_content(65536):
+                        buf.write(chunk)
+                    if raw_content:
+                        # Para consumo en proceso: sin costo de b64encode + b64decode
+                        resultado["archivo_bytes"] = buf.getvalue()
+                    else:
+                        resultado["archivo_base64"] = _b64encode(buf.getbuffer()).decode("ascii")
+                    resultado["content_type"] = archivo_resp.headers.get("Content-Type")
             except Exception as file_exc:
                 resultado["archivo_error"] = str(file_exc)
         return resultado
@@ -220,6 +468,81 @@ def _generar_doc(
         return None
 
 
+# Cache en memoria de _generar_doc: las rutas generadas expiran del lado del
+# servidor, por lo que las entradas llevan TTL (5 min por defecto) y un tope
+# de tamaño con expulsión de las entradas más próximas a vencer.
+_DOC_CACHE_TTL = float(os.getenv("FIELWEB_DOC_CACHE_TTL", "300"))
+_DOC_CACHE_MAX = int(os.getenv("FIELWEB_DOC_CACHE_MAX", "2048"))
+_DOC_CACHE_LOCK = threading.Lock()
+_DOC_CACHE: Dict[Any, Any] = {}
+
+
+def _doc_cache_store(key: Any, value: Any) -> None:
+    """Inserta respetando el tope: primero purga vencidas, luego las más viejas."""
+    now = time.time()
+    with _DOC_CACHE_LOCK:
+        if len(_DOC_CACHE) >= _DOC_CACHE_MAX:
+            vencidas = [k for k, v in _DOC_CACHE.items() if v[0] <= now]
+            for k in vencidas:
+                del _DOC_CACHE[k]
+            while len(_DOC_CACHE) >= _DOC_CACHE_MAX:
+                mas_vieja = min(_DOC_CACHE, key=lambda k: _DOC_CACHE[k][0])
+                del _DOC_CACHE[mas_vieja]
+        _DOC_CACHE[key] = (now + _DOC_CACHE_TTL, value)
+# Llamadas en vuelo por clave: el primer hilo dispara el POST y los demas
+# esperan en el Event en lugar de repetir la generacion bajo rafagas.
+_DOC_INFLIGHT: Dict[Any, threading.Event] = {}
+
+
+def _generar_doc_cached(
+    sess: requests.Session,
+    norma_id: int,
+    titulo: str,
+    concordancias: bool,
+    formato: str,
+    include_content: bool = False,
+    raw_content: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Version cacheada de _generar_doc; evita repetir POSTs por combinaciones ya resueltas."""
+    if include_content or raw_content:
+        # Las variantes con contenido arrastran archivo_base64/archivo_bytes
+        # (varios MB por entrada): se generan directo, al cache solo entra la
+        # metadata liviana (rutas y URLs).
+        return _generar_doc(sess, norma_id, titulo, concordancias, formato, include_content, raw_content)
+    key = (norma_id, formato.lower(), bool(concordancias), bool(include_content), bool(raw_content))
+    now = time.time()
+    with _DOC_CACHE_LOCK:
+        hit = _DOC_CACHE.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        evento = _DOC_INFLIGHT.get(key)
+        if evento is None:
+            evento = threading.Event()
+            _DOC_INFLIGHT[key] = evento
+            es_lider = True
+        else:
+            es_lider = False
+
+    if not es_lider:
+        evento.wait(timeout=60)
+        with _DOC_CACHE_LOCK:
+            hit = _DOC_CACHE.get(key)
+        if hit and hit[0] > time.time():
+            return hit[1]
+        # El lider fallo o expiro el timeout: cada hilo reintenta por su cuenta
+        return _generar_doc(sess, norma_id, titulo, concordancias, formato, include_content, raw_content)
+
+    try:
+        result = _generar_doc(sess, norma_id, titulo, concordancias, formato, include_content, raw_content)
+        if result is not None:
+            _doc_cache_store(key, result)
+        return result
+    finally:
+        with _DOC_CACHE_LOCK:
+            _DOC_INFLIGHT.pop(key, None)
+        evento.set()
+
+
 def _filename_from_ruta(ruta: Optional[str], norma_id: int, formato: str) -> str:
     ext_map = {"pdf": "pdf", "word": "doc", "html": "html"}
     if ruta:
@@ -242,24 +565,21 @@ def descargar_norma_archivo(
     """
     fmt = (formato or "pdf").lower()
     sess = _session()
-    _login_and_token(sess)
-    info = _generar_doc(
+    _ensure_token(sess)
+    info = _generar_doc_cached(
         sess,
         norma_id,
         titulo or f"Norma {norma_id}",
         bool(concordancias),
         fmt,
         include_content=True,
+        raw_content=True,
     )
     if not info:
         return None
-    archivo_base64 = info.get("archivo_base64")
-    if not archivo_base64:
+    content_bytes = info.get("archivo_bytes")
+    if not content_bytes:
         return {"error": info.get("archivo_error") or "No se pudo descargar el archivo."}
-    try:
-        content_bytes = base64.b64decode(archivo_base64)
-    except Exception:
-        return {"error": "No se pudo decodificar el archivo."}
     return {
         "content_bytes": content_bytes,
         "content_type": info.get("content_type"),
@@ -267,38 +587,43 @@ def descargar_norma_archivo(
     }
 
 
-def _map_result(item: Dict[str, Any], descargar_pdf: bool, sess: requests.Session) -> Dict[str, Any]:
-    reg_img = _as_dict(item.get("registroOficialImagen"))
+def _intern(value: Any) -> Any:
+    # Campos categoricos (emisor, area, tipos) se repiten en decenas de
+    # resultados por pagina: internarlos colapsa las copias a un solo objeto.
+    if type(value) is str and 0 < len(value) < 64:
+        return sys.intern(value)
+    return value
+
+
+def _map_result(item: Dict[str, Any]) -> Dict[str, Any]:
+    # Mapper puro: no hace I/O por item. Los PDFs y descargas se resuelven en
+    # el fan-out por lotes de _buscar, que escribe sobre el dict resultante.
+    item_get = item.get
+    reg_img = _as_dict(item_get("registroOficialImagen"))
     ro_info = _build_ro_links(reg_img)
-    pdf_info = None
-    if descargar_pdf:
-        pdf_info = _download_pdf(
-            sess,
-            ro_info.get("nav"),
-            ro_info.get("tpag"),
-            ro_info.get("pag"),
-            reg_img.get("NombreResultados") or item.get("fuente"),
-        )
+    # Campos consultados mas de una vez: una sola busqueda en el dict
+    fuente = item_get("fuente")
+    ro_titulo = reg_img.get("NombreResultados") or fuente
     return {
-        "area_principal": item.get("area"),
-        "tipo_documento": item.get("tipoDocumento"),
-        "numero": item.get("numero"),
-        "titulo": item.get("titulo"),
-        "tipo_publicacion": item.get("tipoPublicacion"),
-        "fecha_publicacion": item.get("fechaPublicacion"),
-        "fecha_emision": item.get("fechaExpedicion"),
-        "derogado": item.get("derogado"),
-        "emisor": item.get("emisor"),
-        "fuente": item.get("fuente"),
-        "norma_id": item.get("normaID"),
-        "aciertos": item.get("aciertos"),
+        "area_principal": _intern(item_get("area")),
+        "tipo_documento": _intern(item_get("tipoDocumento")),
+        "numero": item_get("numero"),
+        "titulo": item_get("titulo"),
+        "tipo_publicacion": _intern(item_get("tipoPublicacion")),
+        "fecha_publicacion": item_get("fechaPublicacion"),
+        "fecha_emision": item_get("fechaExpedicion"),
+        "derogado": item_get("derogado"),
+        "emisor": _intern(item_get("emisor")),
+        "fuente": _intern(fuente),
+        "norma_id": item_get("normaID"),
+        "aciertos": item_get("aciertos"),
         "registro_oficial": {
-            "titulo": reg_img.get("NombreResultados") or item.get("fuente"),
+            "titulo": ro_titulo,
             "raw_url": reg_img.get("Url"),
             **ro_info,
             # Endpoint de descarga PDF: requiere POST con HTML (payload observado en generarPDF)
-            "download_endpoint": f"{FIELWEB_BASE}/app/tpl/visualizador/visualizador.aspx/generarPDF",
-            "pdf": pdf_info,
+            "download_endpoint": _DOWNLOAD_ENDPOINT,
+            "pdf": None,
         },
         "descargas": {
             # generamos rutas on-demand en consultar_fielweb cuando se pide descargar_pdf
@@ -329,9 +654,7 @@ def _build_citation(item: Dict[str, Any]) -> Dict[str, Optional[str]]:
         partes.append(emisor)
     texto = ". ".join([p for p in partes if p]).strip()
 
-    url = None
-    if norma_id:
-        url = f"{FIELWEB_BASE}/Index.aspx?nid={norma_id}#norma/{norma_id}"
+    url = _INDEX_URL_TEMPLATE.format(nid=norma_id) if norma_id else None
 
     return {"texto": texto, "url": url}
 
@@ -366,37 +689,66 @@ def _buscar(
         "d": None,
         "reformas": reformas,
     }
-    data = _post_json(sess, "/app/tpl/buscador/busquedas.aspx/buscar", payload)
-    data_block = _as_dict(data.get("d"))
-    resultado = data_block.get("Data") or []
-    if isinstance(resultado, dict):
+    data = _post_json(sess, _URL_BUSCAR, payload)
+    _, resultado = _d_data(data)
+    resultado = resultado or []
+    if type(resultado) is dict:
         resultado = [resultado]
-    if not isinstance(resultado, list):
+    elif type(resultado) is not list:
         resultado = []
     if isinstance(limite_resultados, int) and limite_resultados > 0:
         resultado = resultado[:limite_resultados]
     mapped: List[Dict[str, Any]] = []
+    raw_items: List[Dict[str, Any]] = []
     for r in resultado:
-        if not isinstance(r, dict):
+        # El parser JSON solo produce dicts planos: comparacion de punteros
+        if type(r) is not dict:
             continue
-        mapped_item = _map_result(r, descargar_pdf, sess)
-        if incluir_descargas:
-            norma_id = r.get("normaID")
-            titulo = r.get("titulo") or ""
-            if norma_id:
+        # El fan-out de PDFs/descargas se hace en lote mas abajo
+        mapped.append(_map_result(r))
+        raw_items.append(r)
+
+    if mapped and (descargar_pdf or incluir_descargas):
+        pool = _FANOUT_EXECUTOR
+        futuros: Dict[Any, Any] = {}
+        for mapped_item, r in zip(mapped, raw_items):
+            if descargar_pdf:
+                ro = mapped_item.get("registro_oficial") or {}
+                fut = pool.submit(
+                    _download_pdf,
+                    sess,
+                    ro.get("nav"),
+                    ro.get("tpag"),
+                    ro.get("pag"),
+                    ro.get("titulo"),
+                )
+                futuros[fut] = ("pdf", mapped_item, None)
+            if incluir_descargas:
+                norma_id = r.get("normaID")
+                titulo = r.get("titulo") or ""
                 try:
-                    nid = int(norma_id)
+                    nid = int(norma_id) if norma_id else None
                 except Exception:
                     nid = None
                 if nid:
                     for fmt in ("pdf", "word", "html"):
-                        sin = _generar_doc(sess, nid, titulo, False, fmt, include_content=incluir_descargas)
-                        con = _generar_doc(sess, nid, titulo, True, fmt, include_content=incluir_descargas)
-                        key_sin = f"{fmt}_sin"
-                        key_con = f"{fmt}_con"
-                        mapped_item.setdefault("descargas", {})[key_sin] = sin
-                        mapped_item.setdefault("descargas", {})[key_con] = con
-        mapped.append(mapped_item)
+                        for conc in (False, True):
+                            fut = pool.submit(
+                                _generar_doc_cached, sess, nid, titulo, conc, fmt, incluir_descargas
+                            )
+                            clave = f"{fmt}_{'con' if conc else 'sin'}"
+                            futuros[fut] = ("descarga", mapped_item, clave)
+        for fut in as_completed(futuros):
+            tipo, mapped_item, clave = futuros[fut]
+            try:
+                valor = fut.result()
+            except Exception:
+                valor = None
+            if tipo == "pdf":
+                mapped_item["registro_oficial"]["pdf"] = valor
+            else:
+                # _map_result siempre inicializa "descargas": escritura directa
+                mapped_item["descargas"][clave] = valor
     return {
         "mensaje": f"Resultados para '{texto}'",
         "nivel_consulta": "FielWeb",
@@ -408,11 +760,66 @@ def _buscar(
     }
 
 
+# Cache de busquedas repetidas: frases legales comunes se consultan varias
+# veces en minutos; un TTL corto evita repetir el POST a buscar completo.
+# No se cachean busquedas con descargar_pdf ni incluir_descargas (payloads
+# grandes; el cache de documentos ya deduplica las descargas).
+_SEARCH_CACHE_TTL = float(os.getenv("FIELWEB_SEARCH_CACHE_TTL", "180"))
+_SEARCH_CACHE_MAX = int(os.getenv("FIELWEB_SEARCH_CACHE_MAX", "256"))
+_SEARCH_CACHE_LOCK = threading.Lock()
+_SEARCH_CACHE: Dict[Any, Any] = {}
+
+
+def _search_cache_store(key: Any, value: Any) -> None:
+    now = time.time()
+    with _SEARCH_CACHE_LOCK:
+        if len(_SEARCH_CACHE) >= _SEARCH_CACHE_MAX:
+            vencidas = [k for k, v in _SEARCH_CACHE.items() if v[0] <= now]
+            for k in vencidas:
+                del _SEARCH_CACHE[k]
+            while len(_SEARCH_CACHE) >= _SEARCH_CACHE_MAX:
+                mas_vieja = min(_SEARCH_CACHE, key=lambda k: _SEARCH_CACHE[k][0])
+                del _SEARCH_CACHE[mas_vieja]
+        _SEARCH_CACHE[key] = (now + _SEARCH_CACHE_TTL, value)
+
+
+def _buscar_cached(
+    sess: requests.Session,
+    token: str,
+    texto: str,
+    seccion: int,
+    reformas: str,
+    page: int,
+    descargar_pdf: bool,
+    incluir_descargas: bool,
+    limite_resultados: Optional[int],
+) -> Dict[str, Any]:
+    if descargar_pdf or incluir_descargas or _SEARCH_CACHE_TTL <= 0:
+        return _buscar(
+            sess, token, texto, seccion, reformas, page,
+            descargar_pdf, incluir_descargas, limite_resultados,
+        )
+    clave = (" ".join(texto.lower().split()), seccion, reformas, page, incluir_descargas, limite_resultados)
+    now = time.time()
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(clave)
+    if hit and hit[0] > now:
+        # Copia superficial: consultar_fielweb agrega claves (norma_detalle)
+        # sobre el dict devuelto y no debe mutar la entrada cacheada.
+        return dict(hit[1])
+    base = _buscar(
+        sess, token, texto, seccion, reformas, page,
+        descargar_pdf, incluir_descargas, limite_resultados,
+    )
+    _search_cache_store(clave, base)
+    return dict(base)
+
+
 def _traer_detalle_norma(sess: requests.Session, norma_id: int) -> Optional[Dict[str, Any]]:
     try:
-        data = _post_json(sess, "/app/tpl/norma/norma.aspx/traerDetalleNorma", {"idNorma": norma_id})
-        data_block = _as_dict(data.get("d"))
-        return data_block.get("Data")
+        data = _post_json(sess, _URL_DETALLE_NORMA, {"idNorma": norma_id})
+        _, detalle = _d_data(data)
+        return detalle
     except Exception:
         return None
 
@@ -425,16 +832,16 @@ def _traer_parte_norma(
     try:
         data = _post_json(
             sess,
-            "/app/tpl/norma/norma.aspx/traerParteNorma",
+            _URL_PARTE_NORMA,
             {"id": norma_id, "d": d_value, "h": h_value},
         )
-        data_block = _as_dict(data.get("d"))
-        return data_block.get("Data")
+        _, parte = _d_data(data)
+        return parte
     except Exception:
         return None
 
 
-def consultar_fielweb(payload: Dict[str, Any]) -> Dict[str, Any]:
+def consultar_fielweb(payload: Dict[str, Any], _reintento: bool = False) -> Dict[str, Any]:
     """
     Parámetros de entrada:
       - texto / consulta: término de búsqueda (obligatorio)
@@ -478,40 +885,68 @@ def consultar_fielweb(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         sess = _session()
-        token = _login_and_token(sess)
-        base = _buscar(
-            sess,
-            token,
-            texto,
-            seccion,
-            reformas,
-            page,
-            descargar_pdf,
-            incluir_descargas,
-            limite_resultados,
-        )
+        token = _ensure_token(sess)
 
-        # Opcional: traer detalle y parte de norma si se solicita
+        # Opcional: detalle y parte de norma. Son requests independientes de la
+        # busqueda, asi que se lanzan en paralelo para pagar solo la latencia
+        # del request mas lento en vez de tres RTTs en serie.
         norma_id = payload.get("norma_id") or payload.get("id_norma")
+        norma_id_int: Optional[int] = None
         if norma_id:
             try:
                 norma_id_int = int(norma_id)
-                detalle = _traer_detalle_norma(sess, norma_id_int)
+            except Exception:
+                norma_id_int = None
+
+        parte_args: Optional[Tuple[int, int]] = None
+        if norma_id_int:
+            try:
                 parte_d = payload.get("parte_d")
                 parte_h = payload.get("parte_h")
-                parte = None
-                try:
-                    if parte_d is not None and parte_h is not None:
-                        parte = _traer_parte_norma(sess, norma_id_int, int(parte_d), int(parte_h))
-                except Exception:
-                    parte = None
-                base["norma_detalle"] = detalle
-                if parte is not None:
-                    base["norma_parte"] = parte
+                if parte_d is not None and parte_h is not None:
+                    parte_args = (int(parte_d), int(parte_h))
             except Exception:
-                base["norma_detalle"] = {"error": "No se pudo obtener detalle de norma"}
+                parte_args = None
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            f_buscar = pool.submit(
+                _buscar_cached,
+                sess,
+                token,
+                texto,
+                seccion,
+                reformas,
+                page,
+                descargar_pdf,
+                incluir_descargas,
+                limite_resultados,
+            )
+            f_detalle = pool.submit(_traer_detalle_norma, sess, norma_id_int) if norma_id_int else None
+            f_parte = (
+                pool.submit(_traer_parte_norma, sess, norma_id_int, parte_args[0], parte_args[1])
+                if parte_args
+                else None
+            )
+            base = f_buscar.result()
+            if norma_id:
+                if norma_id_int is None:
+                    base["norma_detalle"] = {"error": "No se pudo obtener detalle de norma"}
+                else:
+                    try:
+                        base["norma_detalle"] = f_detalle.result() if f_detalle else None
+                        parte = f_parte.result() if f_parte else None
+                        if parte is not None:
+                            base["norma_parte"] = parte
+                    except Exception:
+                        base["norma_detalle"] = {"error": "No se pudo obtener detalle de norma"}
         return base
     except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code in (401, 403):
+            # Token cacheado vencido del lado del servidor: re-login lazy y un
+            # solo reintento de la consulta completa.
+            _invalidate_token()
+            if not _reintento:
+                return consultar_fielweb(payload, _reintento=True)
         return {
             "error": f"HTTP {e.response.status_code} en FielWeb: {e.response.text}",
             "nivel_consulta": "FielWeb",
@@ -519,3 +954,50 @@ def consultar_fielweb(payload: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error FielWeb: {e}", "nivel_consulta": "FielWeb"}
 
+
+def consultar_fielweb_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parámetros de entrada:
+      - consultas / textos: lista de términos (str) o sub-payloads (dict) a consultar.
+      - max_concurrency (opcional, por defecto 5): cuántas consultas corren en paralelo.
+      - el resto de claves del payload se aplican como base a cada consulta
+        (seccion, reformas, descargas, etc.).
+
+    El login ya es compartido (token cacheado con TTL y sesion keep-alive), asi
+    que el costo por consulta colapsa a busqueda + mapeo; el paralelismo queda
+    acotado para no saturar FielWeb.
+    """
+    if not isinstance(payload, dict):
+        return {"error": "Payload inválido (se esperaba objeto JSON).", "nivel_consulta": "FielWeb"}
+
+    consultas = payload.get("consultas") or payload.get("textos")
+    if not isinstance(consultas, list) or not consultas:
+        return {"error": "Debe proporcionar 'consultas' (lista de textos).", "nivel_consulta": "FielWeb"}
+
+    try:
+        max_concurrency = int(payload.get("max_concurrency") or 5)
+    except Exception:
+        max_concurrency = 5
+    # Tope absoluto de hilos: el valor del payload no puede disparar el pool
+    # aunque la lista de consultas sea enorme.
+    max_concurrency = max(1, min(max_concurrency, len(consultas), 16))
+
+    base = {
+        k: v
+        for k, v in payload.items()
+        if k not in ("consultas", "textos", "max_concurrency")
+    }
+
+    def _una_consulta(consulta: Any) -> Dict[str, Any]:
+        if type(consulta) is dict:
+            sub_payload = {**base, **consulta}
+        else:
+            sub_payload = {**base, "texto": consulta}
+        return consultar_fielweb(sub_payload)
+
+    with ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="fielweb-batch"
+    ) as pool:
+        resultados = list(pool.map(_una_consulta, consultas))
+
+    return {"total_consultas": len(resultados), "resultados": resultados}
@@ -1,13 +1,17 @@
 import os
+import sys
 import asyncio
 import base64
 import json
 import re
 import textwrap
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin, quote
+from typing import List, Dict, Any, Optional, Sequence
+from urllib.parse import urljoin, quote, urlsplit, urlunsplit, parse_qsl, urlencode
 import requests
+import httpx
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 from fpdf import FPDF
@@ -21,24 +25,6 @@ def debug_log(msg: str):
     if DEBUG:
         print(f"[DEBUG] {msg}")
 
-# ================================
-# 🧩 COMPATIBILIDAD CON RENDER
-# ================================
-def aplicar_nest_asyncio_si_es_necesario():
-    """Permite compatibilidad entre Render y entornos locales."""
-    try:
-        import nest_asyncio
-        loop = asyncio.get_event_loop()
-        if "uvloop" not in str(type(loop)).lower():
-            nest_asyncio.apply()
-            debug_log("nest_asyncio aplicado correctamente (modo local).")
-        else:
-            debug_log("uvloop detectado, no se aplica nest_asyncio (modo Render).")
-    except Exception as e:
-        print(f"⚠️ No se aplicó nest_asyncio: {e}")
-
-aplicar_nest_asyncio_si_es_necesario()
-
 # ================================
 # ⚙️ CONFIGURACIÓN DE ENTORNO
 # ================================
@@ -58,6 +44,21 @@ URLS = {
 PAGE_TIMEOUT_MS = 30_000
 NAV_TIMEOUT_MS  = 35_000
 MAX_ITEMS       = 10
+# Tope global de la consulta multi-fuente: pasado este tiempo se devuelven
+# resultados parciales en lugar de esperar a la fuente mas lenta.
+JURIS_TOTAL_TIMEOUT_S = float(os.getenv("JURIS_TOTAL_TIMEOUT", "30"))
+
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-setuid-sandbox",
+    "--disable-web-security",
+    # Los scrapers no renderizan: sin decodificar imagenes ni un proceso
+    # de renderer por origen se ahorra CPU y memoria por navegacion.
+    "--blink-settings=imagesEnabled=false",
+    "--disable-features=IsolateOrigins,site-per-process",
+]
 
 # ================================
 # Proxy opcional desde entorno
@@ -82,21 +83,54 @@ def _proxy_config() -> Optional[dict]:
 # ================================
 # 🔧 UTILIDADES INTERNAS
 # ================================
-async def _first_selector(page, selectors: List[str]) -> Optional[str]:
-    for sel in selectors:
-        try:
-            if await page.query_selector(sel):
-                return sel
-        except Exception:
-            continue
-    return None
-
-async def _safe_inner_text(node, default="") -> str:
+# Ganadores por rol ("satje.query", "cc.boton", ...): la estructura de cada
+# sitio es estable, asi que el selector que acerto una vez se prueba primero.
+_SELECTOR_HITS: Dict[str, str] = {}
+
+
+# Grupos de selectores candidatos (constantes de módulo, en orden de prioridad)
+_SATJE_QUERY_SELECTORS = ("#txtBuscar", 'input[id*="Buscar"]')
+_SATJE_BOTON_SELECTORS = ("#btnBuscar", 'button[id*="btnBuscar"]')
+_CC_QUERY_SELECTORS = (
+    'input[placeholder*="Digite el texto"]',
+    'input[placeholder*="Buscar"]',
+    'input[name*="texto"]',
+    'input[type="text"]',
+)
+_CC_BOTON_SELECTORS = (
+    'button:has-text("Buscar")',
+    'button[aria-label*="Buscar"]',
+    'button[type="submit"]',
+    'button:has(svg)',
+)
+
+async def _first_selector(page, selectors: Sequence[str], role: Optional[str] = None) -> Optional[str]:
+    if role:
+        cacheado = _SELECTOR_HITS.get(role)
+        if cacheado:
+            try:
+                if await page.query_selector(cacheado):
+                    return cacheado
+            except Exception:
+                pass
+    # Sonda agrupada: un solo round-trip descarta todos los candidatos a la
+    # vez cuando ninguno existe en la página.
     try:
-        txt = (await node.inner_text()).strip()
-        return txt or default
+        if await page.query_selector(", ".join(selectors)) is None:
+            return None
     except Exception:
-        return default
+        pass
+    # Las sondas viajan juntas al navegador en vez de un round-trip CDP por
+    # candidato; gana el primero (en orden de prioridad) que exista en el DOM.
+    resultados = await asyncio.gather(
+        *(page.query_selector(sel) for sel in selectors), return_exceptions=True
+    )
+    for sel, res in zip(selectors, resultados):
+        if res and not isinstance(res, Exception):
+            if role:
+                _SELECTOR_HITS[role] = sel
+            return sel
+    return None
 
 def _abs_url(base: str, href: str) -> str:
     try:
@@ -104,14 +138,37 @@ def _abs_url(base: str, href: str) -> str:
     except Exception:
         return href or ""
 
+def _canon_url(url: str) -> str:
+    """
+    Clave canonica para dedup: host en minusculas sin puerto por defecto,
+    query ordenada, sin fragmento ni slash final. Asi dos enlaces al mismo
+    documento con la query en otro orden no pasan como distintos.
+    """
+    try:
+        partes = urlsplit(url)
+    except Exception:
+        return url
+    host = (partes.hostname or "").lower()
+    if partes.port and not (
+        (partes.scheme == "http" and partes.port == 80)
+        or (partes.scheme == "https" and partes.port == 443)
+    ):
+        host = f"{host}:{partes.port}"
+    query = urlencode(sorted(parse_qsl(partes.query, keep_blank_values=True)))
+    path = partes.path.rstrip("/") or "/"
+    return urlunsplit((partes.scheme.lower(), host, path, query, ""))
+
+
 def _dedup(items: List[Dict[str, Any]], key: str = "url") -> List[Dict[str, Any]]:
-    seen, out = set(), []
+    # Un solo dict con orden de insercion reemplaza al par set+list;
+    # setdefault hace un solo hash por item y conserva la primera aparicion.
+    unicos: Dict[Any, Dict[str, Any]] = {}
+    setdefault = unicos.setdefault
     for i in items:
         val = i.get(key)
-        if val and val not in seen:
-            seen.add(val)
-            out.append(i)
-    return out
+        if val:
+            setdefault(_canon_url(val) if key == "url" and type(val) is str else val, i)
+    return list(unicos.values())
 
 def _norm_fecha(valor: Any) -> str:
     """
@@ -272,13 +329,46 @@ def _post_juriscopio(url: str, body: Dict[str, Any], referer: str) -> Dict[str,
         raise RuntimeError(f"Juriscopio respondió {resp.status_code}: {data}")
     return data
 
-def _pick(d: Dict[str, Any], keys: List[str]) -> Any:
+def _pick(d: Dict[str, Any], keys: Sequence[str]) -> Any:
+    # Un solo lookup por clave (get en vez de "in" + indexado); se recorre la
+    # tupla de candidatos en orden de prioridad y gana el primer valor útil.
+    dget = d.get
     for k in keys:
-        if k in d and d[k] not in (None, "", []):
-            return d[k]
+        v = dget(k)
+        if v not in (None, "", []):
+            return v
     return ""
 
 
+# Claves candidatas de los mapeos por item, congeladas una sola vez en el
+# import en lugar de construir la lista en cada iteración.
+_K_SENT_NUMERO = ("numeroSentencia", "numSentencia", "numerosentencia", "numero")
+_K_SENT_CAUSA = ("numeroCausa", "numCausa", "numerocausa")
+_K_SENT_FECHA = ("fechaDecision", "fechaNotificacion", "fecha", "fechaIngreso")
+_K_SENT_JUEZ = ("nombrejuez", "juez", "juezPonente", "loginjuez")
+_K_SENT_DECISION = ("decision", "resolucion")
+_K_SENT_PDF = ("urlPdf", "urlpdf", "urlSentencia", "urlauto")
+_K_SEL_CAUSA = ("numeroCausa", "numerocausa")
+_K_SEL_CAUSA_AUTO = ("numeroCausaAuto", "numerocausaauto")
+_K_SEL_FECHA = ("fechaIngreso", "fechaingreso", "fecha")
+_K_SEL_JUEZ = ("nombrejuez", "juez")
+_K_SEL_PRONUNCIAMIENTO = ("pronunciamientoDelInferior", "pronunciamientoInferior", "pronunciamiento")
+_K_SEL_ESTADO = ("estadoProcesal", "estado", "estadoProceso")
+_K_SEL_PDF = ("urlPdf", "urlauto", "urlAuto", "url")
+_K_ADM_FECHA = ("fechaDecision", "fecha", "fechaIngreso")
+_K_ADM_JUEZ = ("juez", "nombrejuez")
+_K_ADM_TIPO_ACCION = ("tipoaccion", "tipoAccion")
+_K_ADM_PDF = ("urlPdf", "url")
+
+# Alias de seccion aceptados por los routers de Juriscopio, congelados una
+# sola vez: la pertenencia sobre frozenset es O(1) por hash.
+_SEC_CAUSAS = frozenset(("causa", "causas", "sentencias/causas"))
+_SEC_SENTENCIAS = frozenset(("sentencia", "sentencias"))
+_SEC_AUTOS = frozenset(("seleccion_autos", "autos_seleccion", "autos"))
+_SEC_SELECCION = frozenset(("seleccion_casos", "casos_ingresados", "seleccion"))
+_SEC_ADMISION = frozenset(("admision", "admisión"))
+
+
 def _normalize_incidente_list(raw: Any, informacion: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     if raw is None:
         return []
@@ -380,7 +470,6 @@ async def _click_recaptcha_checkbox(page) -> bool:
             debug_log("reCAPTCHA marcado (checkbox en estado checked).")
         except Exception:
             debug_log("No se detectó estado 'checked' en reCAPTCHA (puede requerir reto adicional).")
-        await page.wait_for_timeout(1200)
         return True
     except Exception:
         return False
@@ -388,36 +477,148 @@ async def _click_recaptcha_checkbox(page) -> bool:
 # ================================
 # 🔎 FUNCIONES DE BÚSQUEDA
 # ================================
+# Plantillas de fila por fuente: los campos constantes (internados) se
+# comparten entre todas las filas en vez de re-crear los literales por item.
+_TPL_SATJE = {
+    "fuente": sys.intern("SATJE"),
+    "descripcion": sys.intern("Sentencia registrada en SATJE"),
+}
+_TPL_CC = {
+    "fuente": sys.intern("Corte Constitucional"),
+    "descripcion": sys.intern("Relatoría o sentencia Corte Constitucional"),
+}
+
+
+# Cliente HTTP async compartido para los caminos sin navegador; vive en el
+# loop de fondo igual que el Chromium compartido.
+_HTTPX_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+async def _http_client() -> httpx.AsyncClient:
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None or _HTTPX_CLIENT.is_closed:
+        _HTTPX_CLIENT = httpx.AsyncClient(
+            timeout=15.0,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; H&G Abogados IA)"},
+        )
+    return _HTTPX_CLIENT
+
+
+async def _buscar_satje_http(texto: str) -> List[Dict[str, Any]]:
+    """
+    SATJE via HTTP puro: la pagina WebForms renderiza los resultados en el
+    servidor, asi que basta replicar el postback (__VIEWSTATE + campos del
+    formulario) sin levantar Chromium. Si algo no calza, el caller cae al
+    camino con navegador.
+    """
+    url = URLS["satje"]
+    client = await _http_client()
+    r = await client.get(url)
+    r.raise_for_status()
+    soup = BeautifulSoup(r.text, "lxml")
+
+    form: Dict[str, str] = {}
+    for campo in soup.select("input[type=hidden]"):
+        nombre = campo.get("name")
+        if nombre:
+            form[nombre] = campo.get("value") or ""
+    caja = soup.select_one("#txtBuscar, input[id*='Buscar'][type='text']")
+    boton = soup.select_one("#btnBuscar, input[id*='btnBuscar'], button[id*='btnBuscar']")
+    if caja is None or boton is None:
+        return []
+    form[caja.get("name") or "txtBuscar"] = texto
+    nombre_boton = boton.get("name")
+    if nombre_boton:
+        form[nombre_boton] = boton.get("value") or "Buscar"
+
+    r2 = await client.post(url, data=form)
+    r2.raise_for_status()
+    soup_res = BeautifulSoup(r2.text, "lxml")
+    # Solo se confia en el postback si aparecen nodos especificos del grid de
+    # resultados: un POST que re-renderiza la portada devolveria filas de
+    # menu como falsos resultados y ademas taparia el fallback con navegador.
+    nodos_res = soup_res.select(
+        ".DataGridItemStyle, .DataGridAlternatingItemStyle, .resultado"
+    )
+    if not nodos_res:
+        return []
+    resultados: List[Dict[str, Any]] = []
+    for nodo in nodos_res[:MAX_ITEMS]:
+        anchors = nodo.find_all("a", href=True)
+        if not anchors:
+            continue
+        titulo = nodo.get_text("\n", strip=True).split("\n", 1)[0][:140]
+        for a in anchors:
+            resultados.append({
+                **_TPL_SATJE,
+                "titulo": titulo,
+                "url": _abs_url(str(r2.url), a["href"]),
+            })
+    return _dedup(resultados)
+
+
 async def _buscar_satje(page, texto: str) -> List[Dict[str, Any]]:
     """SATJE – Función Judicial"""
     debug_log(f"Consultando SATJE con: {texto}")
+    # Primero el camino barato sin navegador; Playwright queda de fallback.
+    try:
+        via_http = await _buscar_satje_http(texto)
+        if via_http:
+            debug_log("SATJE resuelto por HTTP puro, sin navegador.")
+            return via_http
+    except Exception as e:
+        debug_log(f"SATJE HTTP falló: {e}; se usa el navegador.")
     resultados = []
     await page.goto(URLS["satje"], wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
 
-    q_sel = await _first_selector(page, ["#txtBuscar", 'input[id*="Buscar"]'])
-    b_sel = await _first_selector(page, ["#btnBuscar", 'button[id*="btnBuscar"]'])
+    q_sel = await _first_selector(page, _SATJE_QUERY_SELECTORS, role="satje.query")
+    b_sel = await _first_selector(page, _SATJE_BOTON_SELECTORS, role="satje.boton")
     if not q_sel or not b_sel:
         return []
 
     await page.fill(q_sel, texto)
     await page.click(b_sel)
+    # networkidle casi nunca llega en sitios con polling; esperar el primer
+    # nodo de resultados retorna apenas el DOM es usable.
     try:
-        await page.wait_for_load_state("networkidle", timeout=NAV_TIMEOUT_MS)
+        await page.wait_for_selector(".DataGridItemStyle, .card, tr, .resultado", timeout=NAV_TIMEOUT_MS)
     except PWTimeout:
-        await page.wait_for_timeout(1500)
-
-    nodes = await page.query_selector_all(".DataGridItemStyle, .card, tr, .resultado")
-    for n in nodes[:MAX_ITEMS]:
-        txt = await _safe_inner_text(n)
-        for a in await n.query_selector_all("a"):
-            href = await a.get_attribute("href")
-            if href:
-                resultados.append({
-                    "fuente": "SATJE",
-                    "titulo": txt.split("\n")[0][:140],
-                    "descripcion": "Sentencia registrada en SATJE",
-                    "url": _abs_url(page.url, href)
-                })
+        # Sin nodos de resultado dentro del timeout no hay nada que extraer;
+        # dormir un extra fijo solo sumaba latencia.
+        return []
+
+    # Extraccion completa en un solo page.evaluate: el DOM se recorre dentro
+    # del navegador y vuelve como JSON, un comando CDP en vez de N por tarjeta.
+    try:
+        filas = await page.evaluate(
+            """
+            (maxItems) => {
+                const nodos = Array.from(
+                    document.querySelectorAll('.DataGridItemStyle, .card, tr, .resultado')
+                ).slice(0, maxItems);
+                const filas = [];
+                for (const n of nodos) {
+                    // Solo cruza el protocolo el titulo ya recortado, no el
+                    // innerText completo de la tarjeta.
+                    const titulo = ((n.innerText || '').trim().split('\\n')[0] || '').slice(0, 140);
+                    for (const a of n.querySelectorAll('a')) {
+                        if (a.href) filas.push({titulo, url: a.href});
+                    }
+                }
+                return filas;
+            }
+            """,
+            MAX_ITEMS,
+        )
+    except Exception:
+        filas = []
+    for fila in filas:
+        resultados.append({
+            **_TPL_SATJE,
+            "titulo": fila.get("titulo") or "",
+            "url": fila.get("url")
+        })
     return _dedup(resultados)
 
 async def _buscar_corte_constitucional(page, texto: str) -> List[Dict[str, Any]]:
@@ -427,43 +628,46 @@ async def _buscar_corte_constitucional(page, texto: str) -> List[Dict[str, Any]]
     await page.goto(URLS["corte_constitucional"], wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
 
     # Input principal y botón de búsqueda (ícono de lupa)
-    q_sel = await _first_selector(page, [
-        'input[placeholder*="Digite el texto"]',
-        'input[placeholder*="Buscar"]',
-        'input[name*="texto"]',
-        'input[type="text"]'
-    ])
-    b_sel = await _first_selector(page, [
-        'button:has-text("Buscar")',
-        'button[aria-label*="Buscar"]',
-        'button[type="submit"]',
-        'button:has(svg)'
-    ])
+    q_sel = await _first_selector(page, _CC_QUERY_SELECTORS, role="cc.query")
+    b_sel = await _first_selector(page, _CC_BOTON_SELECTORS, role="cc.boton")
     if not q_sel or not b_sel:
         return []
 
     await page.fill(q_sel, texto[:250])
     await page.click(b_sel)
+    # Igual que en SATJE: esperar tarjetas de resultado en lugar de networkidle
     try:
-        await page.wait_for_load_state("networkidle", timeout=NAV_TIMEOUT_MS)
+        await page.wait_for_selector("mat-card, .card, article, table tbody tr", timeout=NAV_TIMEOUT_MS)
     except PWTimeout:
-        await page.wait_for_timeout(1500)
-
-    # Tarjetas de resultado: anclas a detalles/PDF
-    nodes = await page.query_selector_all("div, article, li, tr")
-    for n in nodes[:MAX_ITEMS]:
-        txt = await _safe_inner_text(n)
-        for a in await n.query_selector_all("a"):
-            href = await a.get_attribute("href")
-            if href:
-                resultados.append({
-                    "fuente": "Corte Constitucional",
-                    "titulo": txt.split("\n")[0][:140],
-                    "descripcion": "Relatoría o sentencia Corte Constitucional",
-                    "url": _abs_url(page.url, href)
-                })
+        return []
+
+    # Tarjetas de resultado: un solo page.content() y parseo local con lxml
+    # en lugar de un round-trip CDP por nodo/atributo.
+    html = await page.content()
+    base_url = page.url
+    soup = BeautifulSoup(html, "lxml")
+    for nodo in soup.select("div, article, li, tr")[:MAX_ITEMS]:
+        anchors = nodo.find_all("a", href=True)
+        if not anchors:
+            continue
+        titulo = nodo.get_text("\n", strip=True).split("\n", 1)[0][:140]
+        for a in anchors:
+            resultados.append({
+                **_TPL_CC,
+                "titulo": titulo,
+                "url": _abs_url(base_url, a["href"]),
+            })
     return _dedup(resultados)
 
+# Regex de fallback de Corte Nacional, compiladas una sola vez en el import
+# en lugar de recompilarse por cada tarjeta de resultado.
+_RE_CN_NRO_PROCESO = re.compile(r"Nro\s*Proceso\s*([0-9]+)", re.IGNORECASE)
+_RE_CN_NUMERO_LARGO = re.compile(r"(\d{7,})")
+_RE_CN_JUEZ = re.compile(r"Juez/a:\s*([^\n]+)", re.IGNORECASE)
+_RE_CN_SALA = re.compile(r"Sala:\s*([^\n]+)", re.IGNORECASE)
+_RE_CN_FECHA = re.compile(r"(\d{1,2}\s+de\s+\w+\s+de\s+\d{4})", re.IGNORECASE)
+
+
 def _tipo_busqueda_corte_nacional(payload: Dict[str, Any]) -> str:
     """
     Determina el modo de búsqueda: aproximada (default) o por número de proceso.
@@ -537,10 +741,11 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
     tipo_busqueda = _tipo_busqueda_corte_nacional(payload or {})
     resultados_url = f"{base}/resultados?query={query}&tipoBusqueda={tipo_busqueda}"
     debug_log(f"Corte Nacional: navegando directo a resultados {resultados_url}")
-    await page.goto(resultados_url, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
+    # wait_until="commit" retorna apenas llega la respuesta de navegacion; el
+    # wait_for_selector de abajo es el que de verdad marca resultados listos.
+    await page.goto(resultados_url, wait_until="commit", timeout=NAV_TIMEOUT_MS)
     try:
-        await page.wait_for_load_state("networkidle", timeout=NAV_TIMEOUT_MS)
-        await page.wait_for_selector("app-resultado, a[href*='Proceso'], a[href*='proceso'], a[href*='.pdf'], .card, article, div.result-card", timeout=8000)
+        await page.wait_for_selector("app-resultado, a[href*='Proceso'], a[href*='proceso'], a[href*='.pdf'], .card, article, div.result-card", timeout=NAV_TIMEOUT_MS)
         if DEBUG:
             try:
                 html_preview = (await page.content())[:1200]
@@ -548,16 +753,17 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
             except Exception:
                 debug_log("Corte Nacional: no se pudo obtener HTML preview.")
     except PWTimeout:
-        await page.wait_for_timeout(1500)
+        debug_log("Corte Nacional: timeout esperando tarjetas de resultado.")
+        return []
 
     # Extraer datos en el contexto de la página para capturar campos (proceso, juez, sala, fecha, pdf)
     try:
         raw_cards = await page.evaluate("""
-        () => {
-            const cards = Array.from(document.querySelectorAll(".resultado-item.card"));
+        (maxItems) => {
+            const cards = Array.from(document.querySelectorAll(".resultado-item.card")).slice(0, maxItems);
             if (!cards.length) {
                 // fallback a otras tarjetas genéricas
-                return Array.from(document.querySelectorAll(".card.shadow-sm, .result-card, mat-card, div[role='listitem']")).map(c=>({cardHTML:c.innerHTML}));
+                return Array.from(document.querySelectorAll(".card.shadow-sm, .result-card, mat-card, div[role='listitem']")).slice(0, maxItems).map(c=>({cardHTML:c.innerHTML}));
             }
             return cards.map(card => {
                 const q = (sel) => card.querySelector(sel);
@@ -602,15 +808,15 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
             };
         });
         }
-        """)
+        """, MAX_ITEMS)
     except Exception:
         raw_cards = []
 
     # Intento adicional: extracción directa de tarjetas reales (.resultado-item.card)
     try:
         raw_cards = await page.evaluate("""
-        () => {
-            const cards = Array.from(document.querySelectorAll(".resultado-item.card"));
+        (maxItems) => {
+            const cards = Array.from(document.querySelectorAll(".resultado-item.card")).slice(0, maxItems);
             if (!cards.length) return [];
             return cards.map(card => {
                 const q = sel => card.querySelector(sel);
@@ -637,7 +843,7 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
                 };
             });
         }
-        """)
+        """, MAX_ITEMS)
     except Exception:
         pass
 
@@ -645,8 +851,8 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
     if not raw_cards:
         try:
             raw_cards = await page.evaluate("""
-            () => {
-                const cards = Array.from(document.querySelectorAll(".resultado-item.card"));
+            (maxItems) => {
+                const cards = Array.from(document.querySelectorAll(".resultado-item.card")).slice(0, maxItems);
                 if (!cards.length) return [];
                 return cards.map(card => {
                     const q  = (sel) => card.querySelector(sel);
@@ -671,7 +877,7 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
                     };
                 });
             }
-            """)
+            """, MAX_ITEMS)
         except Exception:
             raw_cards = []
 
@@ -691,27 +897,26 @@ async def _buscar_corte_nacional(page, texto: str, payload: Optional[Dict[str, A
         sala = (rc.get("sala") or "").strip()
         fecha = (rc.get("fecha") or "").strip()
 
-        # Fallbacks por regex sobre la descripción
-        import re
+        # Fallbacks por regex sobre la descripción (patrones precompilados)
         if not numero_proceso:
-            m = re.search(r"Nro\\s*Proceso\\s*([0-9]+)", descripcion, re.IGNORECASE)
+            m = _RE_CN_NRO_PROCESO.search(descripcion)
             if m:
                 numero_proceso = m.group(1)
             else:
-                m2 = re.search(r"(\\d{7,})", descripcion)
+                m2 = _RE_CN_NUMERO_LARGO.search(descripcion)
                 if m2:
                     numero_proceso = m2.group(1)
 
         if not juez:
-            m = re.search(r"Juez/a:\\s*([^\\n]+)", descripcion, re.IGNORECASE)
+            m = _RE_CN_JUEZ.search(descripcion)
             if m:
                 juez = m.group(1).strip()
         if not sala:
-            m = re.search(r"Sala:\\s*([^\\n]+)", descripcion, re.IGNORECASE)
+            m = _RE_CN_SALA.search(descripcion)
             if m:
                 sala = m.group(1).strip()
         if not fecha:
-            m = re.search(r"(\\d{1,2}\\s+de\\s+\\w+\\s+de\\s+\\d{4})", descripcion, re.IGNORECASE)
+            m = _RE_CN_FECHA.search(descripcion)
             if m:
                 fecha = m.group(1).strip()
 
@@ -820,68 +1025,249 @@ async def _buscar_juris_async(texto: str, payload: Optional[Dict[str, Any]] = No
     if not texto:
         return {"error": "Debe ingresar un texto de búsqueda."}
 
-    launch_args = [
-        "--no-sandbox",
-        "--disable-dev-shm-usage",
-        "--disable-gpu",
-        "--disable-setuid-sandbox",
-        "--disable-web-security"
-    ]
-    proxy_cfg = _proxy_config()
-    if proxy_cfg:
-        debug_log(f"Usando proxy: {proxy_cfg.get('server')}")
-
-    debug_log("Lanzando navegador Chromium para consultas judiciales...")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=launch_args, proxy=proxy_cfg)
-        context = await browser.new_context()
+    browser = await _obtener_browser()
+
+    async def _correr_fuente(fuente, funcion):
+        if _breaker_abierto(fuente):
+            return [{
+                "fuente": fuente,
+                "error": "No disponible temporalmente (circuito abierto tras fallos consecutivos)"
+            }]
+        # Un context liviano por fuente: aislamiento de cookies/estado entre
+        # portales sin relanzar Chromium, reutilizando el storage_state de la
+        # ultima corrida exitosa.
+        context = await _nuevo_context_fuente(browser, fuente)
         page = await context.new_page()
         page.set_default_timeout(PAGE_TIMEOUT_MS)
-
-        resultados = []
         try:
-            # Consulta secuencial y controlada
-            for fuente, funcion in [
-                ("SATJE", _buscar_satje),
-                ("Corte Constitucional", _buscar_corte_constitucional),
-                ("Corte Nacional de Justicia", lambda p, t=texto: _buscar_corte_nacional(p, t, payload)),
-                ("Procesos Judiciales", _buscar_procesos_judiciales),
-            ]:
-                try:
-                    res = await funcion(page, texto)
-                    resultados.extend(res)
-                except Exception as e:
-                    resultados.append({
-                        "fuente": fuente,
-                        "error": f"No disponible: {e}"
-                    })
-
-            resultados = _dedup(resultados)
-            return {
-                "mensaje": f"Consulta completada para '{texto}'.",
-                "nivel_consulta": "Jurisprudencia",
-                "resultado": resultados[:MAX_ITEMS]
-            }
-
+            res = await funcion(page, texto)
+        except Exception:
+            _breaker_registrar(fuente, False)
+            raise
+        else:
+            _breaker_registrar(fuente, True)
+            await _guardar_estado_fuente(fuente, context)
+            return res
         finally:
             await context.close()
-            await browser.close()
-            debug_log("Cierre limpio del navegador Chromium completado.")
+
+    fuentes = [
+        ("SATJE", _buscar_satje),
+        ("Corte Constitucional", _buscar_corte_constitucional),
+        ("Corte Nacional de Justicia", lambda p, t=texto: _buscar_corte_nacional(p, t, payload)),
+        ("Procesos Judiciales", _buscar_procesos_judiciales),
+    ]
+    # Las fuentes son hosts independientes: en paralelo el tiempo total es el
+    # de la fuente mas lenta, con dos cortes tempranos: el tope global de
+    # tiempo y la cuota de resultados (si las primeras fuentes ya llenan
+    # MAX_ITEMS unicos, las rezagadas se cancelan sin esperar su timeout).
+    tareas = {
+        asyncio.ensure_future(_correr_fuente(fuente, funcion)): fuente
+        for fuente, funcion in fuentes
+    }
+    pendientes = set(tareas)
+    limite = asyncio.get_event_loop().time() + JURIS_TOTAL_TIMEOUT_S
+    resultados: List[Dict[str, Any]] = []
+    agotado = False
+    while pendientes:
+        restante = limite - asyncio.get_event_loop().time()
+        if restante <= 0:
+            agotado = True
+            break
+        done, pendientes = await asyncio.wait(
+            pendientes, timeout=restante, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+            agotado = True
+            break
+        for tarea in done:
+            exc = tarea.exception()
+            if exc is not None:
+                resultados.append({
+                    "fuente": tareas[tarea],
+                    "error": f"No disponible: {exc}"
+                })
+            else:
+                resultados.extend(tarea.result())
+        if len(_dedup(resultados)) >= MAX_ITEMS:
+            break
+
+    if agotado:
+        for tarea in pendientes:
+            resultados.append({
+                "fuente": tareas[tarea],
+                "error": f"Timeout global ({JURIS_TOTAL_TIMEOUT_S:.0f}s): fuente cancelada"
+            })
+    for tarea in pendientes:
+        tarea.cancel()
+
+    # Los marcadores de error (timeout, circuito abierto, fuente caida) no
+    # tienen "url" y el dedup los descartaria: se separan y se anexan tras
+    # los resultados deduplicados para que el caller vea que fuentes faltaron.
+    encontrados = _dedup([r for r in resultados if r.get("url")])
+    errores = [r for r in resultados if not r.get("url")]
+    return {
+        "mensaje": f"Consulta completada para '{texto}'.",
+        "nivel_consulta": "Jurisprudencia",
+        "parcial": agotado,
+        "resultado": encontrados[:MAX_ITEMS] + errores
+    }
+
+# ================================
+# ♻️ NAVEGADOR COMPARTIDO
+# ================================
+# Un solo Chromium vivo en un event loop de fondo, reutilizado por todas las
+# consultas: el lanzamiento (1-3 s y cientos de MB por proceso) se paga una
+# vez y cada request solo abre un context liviano.
+_BROWSER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BROWSER_LOOP_LOCK = threading.Lock()
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_ASYNC_LOCK: Optional[asyncio.Lock] = None
+
+
+def _browser_loop() -> asyncio.AbstractEventLoop:
+    """Devuelve (creando si hace falta) el loop de fondo dueño del navegador."""
+    global _BROWSER_LOOP
+    with _BROWSER_LOOP_LOCK:
+        if _BROWSER_LOOP is None or _BROWSER_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            hilo = threading.Thread(target=loop.run_forever, name="judicial-browser-loop", daemon=True)
+            hilo.start()
+            _BROWSER_LOOP = loop
+        return _BROWSER_LOOP
+
+
+# Los scrapers solo extraen texto y enlaces: imagenes, fuentes, media y CSS
+# son bytes y render desperdiciados en cada navegacion (query_selector y los
+# waits no dependen de las hojas de estilo). El set es configurable por env
+# por si algun portal llegara a requerir un tipo bloqueado.
+_BLOCKED_RESOURCE_TYPES = frozenset(
+    t.strip()
+    for t in os.getenv(
+        "JUDICIAL_BLOCKED_RESOURCES", "image,font,media,stylesheet,websocket"
+    ).split(",")
+    if t.strip()
+)
+
+
+async def _bloquear_recursos(context) -> None:
+    """Aborta a nivel de red los recursos que la extracción nunca usa."""
+    async def _route(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    await context.route("**/*", _route)
+
+
+# Circuit breaker por fuente: tras varios fallos consecutivos la fuente se
+# responde con un error inmediato durante una ventana de enfriamiento (que
+# crece exponencialmente si sigue fallando) en vez de pagar el timeout de
+# navegacion completo en cada request. Solo lo toca el loop de fondo.
+_BREAKER_THRESHOLD = int(os.getenv("JUDICIAL_BREAKER_FAILURES", "3"))
+_BREAKER_COOLDOWN_S = float(os.getenv("JUDICIAL_BREAKER_COOLDOWN", "60"))
+_BREAKER: Dict[str, List[float]] = {}  # fuente -> [fallos_consecutivos, abierto_desde]
+
+
+def _breaker_abierto(fuente: str) -> bool:
+    estado = _BREAKER.get(fuente)
+    if not estado or estado[0] < _BREAKER_THRESHOLD:
+        return False
+    ventana = min(_BREAKER_COOLDOWN_S * (2 ** (estado[0] - _BREAKER_THRESHOLD)), 600.0)
+    if time.monotonic() - estado[1] < ventana:
+        return True
+    # Ventana vencida: medio-abierto, se deja pasar el siguiente intento.
+    return False
+
+
+def _breaker_registrar(fuente: str, exito: bool) -> None:
+    if exito:
+        _BREAKER.pop(fuente, None)
+        return
+    estado = _BREAKER.setdefault(fuente, [0.0, 0.0])
+    estado[0] += 1
+    if estado[0] >= _BREAKER_THRESHOLD:
+        estado[1] = time.monotonic()
+
+
+# storage_state por fuente: las cookies de sesion/landing capturadas en una
+# corrida exitosa se inyectan en los contexts siguientes, que parten ya
+# "calientes" y se saltan redirects de bienvenida.
+_STORAGE_STATES: Dict[str, Any] = {}
+
+
+async def _nuevo_context_fuente(browser, fuente: Optional[str] = None):
+    estado = _STORAGE_STATES.get(fuente) if fuente else None
+    if estado:
+        try:
+            context = await browser.new_context(storage_state=estado)
+        except Exception:
+            _STORAGE_STATES.pop(fuente, None)
+            context = await browser.new_context()
+    else:
+        context = await browser.new_context()
+    await _bloquear_recursos(context)
+    return context
+
+
+async def _guardar_estado_fuente(fuente: str, context) -> None:
+    try:
+        _STORAGE_STATES[fuente] = await context.storage_state()
+    except Exception:
+        pass
+
+
+async def _obtener_browser():
+    """
+    Devuelve el Chromium compartido, lanzándolo en el primer uso y
+    relanzándolo si el proceso murió (health check con is_connected).
+    """
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_ASYNC_LOCK
+    if _BROWSER_ASYNC_LOCK is None:
+        _BROWSER_ASYNC_LOCK = asyncio.Lock()
+    async with _BROWSER_ASYNC_LOCK:
+        if _BROWSER is not None and _BROWSER.is_connected():
+            return _BROWSER
+        if _PLAYWRIGHT is None:
+            _PLAYWRIGHT = await async_playwright().start()
+        # Con PW_CDP_URL definido se comparte un Chromium externo entre
+        # workers (un solo navegador en RAM para N procesos gunicorn).
+        cdp_url = os.getenv("PW_CDP_URL", "").strip()
+        if cdp_url:
+            try:
+                debug_log(f"Conectando a Chromium compartido via CDP: {cdp_url}")
+                _BROWSER = await _PLAYWRIGHT.chromium.connect_over_cdp(cdp_url)
+                return _BROWSER
+            except Exception as e:
+                debug_log(f"connect_over_cdp falló ({e}); se lanza Chromium local.")
+        proxy_cfg = _proxy_config()
+        if proxy_cfg:
+            debug_log(f"Usando proxy: {proxy_cfg.get('server')}")
+        debug_log("Lanzando navegador Chromium compartido para consultas judiciales...")
+        _BROWSER = await _PLAYWRIGHT.chromium.launch(headless=True, args=LAUNCH_ARGS, proxy=proxy_cfg)
+        return _BROWSER
+
 
 # ================================
 # ⚙️ UTILIDAD DE EJECUCIÓN BLOQUEANTE
 # ================================
+# Tope de espera del lado sincrono: si una consulta se cuelga en el loop de
+# fondo, el hilo de FastAPI no queda bloqueado para siempre.
+_SYNC_TIMEOUT_S = float(os.getenv("JUDICIAL_SYNC_TIMEOUT", "180"))
+
+
 def _run_async_blocking(coro):
     """
-    Ejecuta la corrutina en un bucle nuevo y aislado para evitar conflictos con uvloop/nest_asyncio.
+    Ejecuta la corrutina en el loop de fondo del navegador compartido; los
+    objetos de Playwright quedan siempre ligados a ese único loop.
     """
-    loop = asyncio.new_event_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, _browser_loop())
     try:
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-        asyncio.set_event_loop(None)
+        return future.result(timeout=_SYNC_TIMEOUT_S)
+    except TimeoutError:
+        future.cancel()
+        raise
 
 # ================================
 # 🌐 INTERFACES INDIVIDUALES
@@ -890,33 +1276,33 @@ async def _buscar_fuente_individual(func, texto: str, fuente: str) -> Dict[str,
     """
     Reutiliza la lógica de navegación para una sola fuente (evita duplicar browsers).
     """
-    launch_args = [
-        "--no-sandbox",
-        "--disable-dev-shm-usage",
-        "--disable-gpu",
-        "--disable-setuid-sandbox",
-        "--disable-web-security"
-    ]
-    proxy_cfg = _proxy_config()
+    if _breaker_abierto(fuente):
+        return {
+            "error": "No disponible temporalmente (circuito abierto tras fallos consecutivos)",
+            "nivel_consulta": fuente,
+        }
     resultados = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=launch_args, proxy=proxy_cfg)
-        context = await browser.new_context()
-        page = await context.new_page()
-        page.set_default_timeout(PAGE_TIMEOUT_MS)
-        try:
-            res = await func(page, texto)
-            resultados.extend(res)
-            resultados = _dedup(resultados)
-            return {
-                "mensaje": f"Consulta completada para '{texto}'.",
-                "nivel_consulta": fuente,
-                "resultado": resultados[:MAX_ITEMS]
-            }
-        finally:
-            await context.close()
-            await browser.close()
-            debug_log("Cierre limpio del navegador Chromium (individual) completado.")
+    browser = await _obtener_browser()
+    context = await _nuevo_context_fuente(browser, fuente)
+    page = await context.new_page()
+    page.set_default_timeout(PAGE_TIMEOUT_MS)
+    try:
+        res = await func(page, texto)
+        _breaker_registrar(fuente, True)
+        await _guardar_estado_fuente(fuente, context)
+        resultados.extend(res)
+        resultados = _dedup(resultados)
+        return {
+            "mensaje": f"Consulta completada para '{texto}'.",
+            "nivel_consulta": fuente,
+            "resultado": resultados[:MAX_ITEMS]
+        }
+    except Exception:
+        _breaker_registrar(fuente, False)
+        raise
+    finally:
+        await context.close()
+        debug_log("Context de consulta (individual) cerrado; navegador compartido sigue vivo.")
 
 def consultar_corte_nacional(payload: Dict[str, Any]) -> Dict[str, Any]:
     texto = (payload.get("texto") or payload.get("palabras_clave") or "").strip()
@@ -943,13 +1329,49 @@ def consultar_procesos_judiciales(payload: Dict[str, Any]) -> Dict[str, Any]:
 # ================================
 # 🧠 INTERFAZ PÚBLICA PARA FASTAPI
 # ================================
+# Cache TTL de jurisprudencia: las mismas frases se consultan repetidas veces
+# desde la UI y los portales no cambian segundo a segundo.
+_JURIS_CACHE_TTL = float(os.getenv("JURIS_CACHE_TTL", "600"))
+_JURIS_CACHE_MAX = 128
+_JURIS_CACHE_LOCK = threading.Lock()
+_JURIS_CACHE: Dict[Any, Any] = {}
+
+
 def consultar_jurisprudencia(payload: Dict[str, Any]) -> Dict[str, Any]:
     texto = (payload.get("texto") or payload.get("palabras_clave") or "").strip()
     if not texto:
         return {"error": "Debe proporcionar un texto válido para búsqueda."}
 
+    clave = (" ".join(texto.lower().split()), _tipo_busqueda_corte_nacional(payload))
+    now = time.time()
+    if _JURIS_CACHE_TTL > 0:
+        with _JURIS_CACHE_LOCK:
+            hit = _JURIS_CACHE.get(clave)
+        if hit and hit[0] > now:
+            return dict(hit[1])
+
     try:
-        return _run_async_blocking(_buscar_juris_async(texto, payload))
+        respuesta = _run_async_blocking(_buscar_juris_async(texto, payload))
+        # Solo se cachean respuestas completas y con contenido: una corrida
+        # parcial (timeout global) o vacia serviria resultados pobres
+        # durante todo el TTL.
+        cacheable = (
+            _JURIS_CACHE_TTL > 0
+            and not respuesta.get("error")
+            and not respuesta.get("parcial")
+            and respuesta.get("resultado")
+        )
+        if cacheable:
+            with _JURIS_CACHE_LOCK:
+                if len(_JURIS_CACHE) >= _JURIS_CACHE_MAX:
+                    vencidas = [k for k, v in _JURIS_CACHE.items() if v[0] <= now]
+                    for k in vencidas:
+                        del _JURIS_CACHE[k]
+                    while len(_JURIS_CACHE) >= _JURIS_CACHE_MAX:
+                        mas_vieja = min(_JURIS_CACHE, key=lambda k: _JURIS_CACHE[k][0])
+                        del _JURIS_CACHE[mas_vieja]
+                _JURIS_CACHE[clave] = (now + _JURIS_CACHE_TTL, respuesta)
+        return respuesta
     except PWTimeout as te:
         return {"error": f"Tiempo de espera agotado: {te}", "nivel_consulta": "Jurisprudencia"}
     except Exception as e:
@@ -1017,17 +1439,17 @@ def _map_sentencia_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     for it in items:
         sentencia = it.get("sentencia") or it
         h_text = " ".join(it.get("highlight", {}).get("textogeneral", []) or [])
-        numero_sentencia = _pick(sentencia, ["numeroSentencia", "numSentencia", "numerosentencia", "numero"])
-        numero_causa = _pick(sentencia, ["numeroCausa", "numCausa", "numerocausa"])
+        numero_sentencia = _pick(sentencia, _K_SENT_NUMERO)
+        numero_causa = _pick(sentencia, _K_SENT_CAUSA)
         resultados.append({
             "fuente": "Juriscopio - Sentencias",
             "numero_sentencia": numero_sentencia,
             "numero_caso": numero_causa,
-            "fecha": _norm_fecha(_pick(sentencia, ["fechaDecision", "fechaNotificacion", "fecha", "fechaIngreso"])),
-            "juez": _pick(sentencia, ["nombrejuez", "juez", "juezPonente", "loginjuez"]),
+            "fecha": _norm_fecha(_pick(sentencia, _K_SENT_FECHA)),
+            "juez": _pick(sentencia, _K_SENT_JUEZ),
             "materia": sentencia.get("materia") or "",
-            "decision": _pick(sentencia, ["decision", "resolucion"]),
-            "pdf_url": _pick(sentencia, ["urlPdf", "urlpdf", "urlSentencia", "urlauto"]),
+            "decision": _pick(sentencia, _K_SENT_DECISION),
+            "pdf_url": _pick(sentencia, _K_SENT_PDF),
             "descripcion": sentencia.get("textogeneral") or h_text or sentencia.get("descripcion") or "",
             "score": it.get("score"),
         })
@@ -1041,14 +1463,14 @@ def _map_seleccion_items(items: List[Dict[str, Any]], etiqueta: str) -> List[Dic
         h_text = " ".join(it.get("highlight", {}).get("textogeneral", []) or [])
         resultados.append({
             "fuente": f"Juriscopio - {etiqueta}",
-            "numero_caso": _pick(nodo, ["numeroCausa", "numerocausa"]),
-            "numero_caso_auto": _pick(nodo, ["numeroCausaAuto", "numerocausaauto"]),
+            "numero_caso": _pick(nodo, _K_SEL_CAUSA),
+            "numero_caso_auto": _pick(nodo, _K_SEL_CAUSA_AUTO),
             "caso_judicatura": nodo.get("casoJudicatura") or "",
-            "fecha": _norm_fecha(_pick(nodo, ["fechaIngreso", "fechaingreso", "fecha"])),
-            "juez": _pick(nodo, ["nombrejuez", "juez"]),
-            "pronunciamiento": _pick(nodo, ["pronunciamientoDelInferior", "pronunciamientoInferior", "pronunciamiento"]),
-            "estado": _pick(nodo, ["estadoProcesal", "estado", "estadoProceso"]),
-            "pdf_url": _pick(nodo, ["urlPdf", "urlauto", "urlAuto", "url"]),
+            "fecha": _norm_fecha(_pick(nodo, _K_SEL_FECHA)),
+            "juez": _pick(nodo, _K_SEL_JUEZ),
+            "pronunciamiento": _pick(nodo, _K_SEL_PRONUNCIAMIENTO),
+            "estado": _pick(nodo, _K_SEL_ESTADO),
+            "pdf_url": _pick(nodo, _K_SEL_PDF),
             "descripcion": nodo.get("textogeneral") or h_text or "",
             "score": it.get("score"),
         })
@@ -1062,12 +1484,12 @@ def _map_admision_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         h_text = " ".join(it.get("highlight", {}).get("textogeneral", []) or [])
         resultados.append({
             "fuente": "Juriscopio - Admisión",
-            "numero_caso": _pick(nodo, ["numeroCausa", "numerocausa"]),
-            "fecha": _norm_fecha(_pick(nodo, ["fechaDecision", "fecha", "fechaIngreso"])),
-            "juez": _pick(nodo, ["juez", "nombrejuez"]),
-            "tipo_accion": _pick(nodo, ["tipoaccion", "tipoAccion"]),
+            "numero_caso": _pick(nodo, _K_SEL_CAUSA),
+            "fecha": _norm_fecha(_pick(nodo, _K_ADM_FECHA)),
+            "juez": _pick(nodo, _K_ADM_JUEZ),
+            "tipo_accion": _pick(nodo, _K_ADM_TIPO_ACCION),
             "decision": nodo.get("decision") or "",
-            "pdf_url": _pick(nodo, ["urlPdf", "url"]),
+            "pdf_url": _pick(nodo, _K_ADM_PDF),
             "descripcion": nodo.get("textogeneral") or h_text or "",
             "score": it.get("score"),
         })
@@ -1221,31 +1643,31 @@ def _buscar_juriscopio_http(payload: Dict[str, Any]) -> Dict[str, Any]:
     base_url = URLS["juriscopio_base"].rstrip("/")
     referer_base = f"{base_url}/buscador-externo/principal"
 
-    if seccion in ("causa", "causas", "sentencias/causas"):
+    if seccion in _SEC_CAUSAS:
         body = _build_causa_payload(texto, numero, modo, payload)
         url = f"{base_url}/buscador-causa-juridico/rest/api/causa/buscar"
         referer = f"{base_url}/buscador-externo/causa/resultado"
         parser = _map_causa_items
         etiqueta = "Causas"
-    elif seccion in ("sentencia", "sentencias"):
+    elif seccion in _SEC_SENTENCIAS:
         body = _build_sentencia_payload(texto, numero, modo, payload)
         url = f"{base_url}/buscador-externo/rest/api/sentencia/100_BUSCR_SNTNCIA"
         referer = f"{referer_base}/resultadoSentencia"
         parser = _map_sentencia_items
         etiqueta = "Sentencias"
-    elif seccion in ("seleccion_autos", "autos_seleccion", "autos"):
+    elif seccion in _SEC_AUTOS:
         body = _build_seleccion_payload("autos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
         parser = lambda items: _map_seleccion_items(items, "Autos de selección")
         etiqueta = "Selección - Autos"
-    elif seccion in ("seleccion_casos", "casos_ingresados", "seleccion"):
+    elif seccion in _SEC_SELECCION:
         body = _build_seleccion_payload("casos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
         parser = lambda items: _map_seleccion_items(items, "Casos ingresados a selección")
         etiqueta = "Selección - Casos"
-    elif seccion in ("admision", "admisión"):
+    elif seccion in _SEC_ADMISION:
         body = _build_admision_payload(texto, numero, "numero" if modo.startswith("numero") else "texto" if modo.startswith("texto") else modo, payload)
         url = f"{base_url}/buscador-admision/rest/api/admision/100_BUSCR_ADMISION"
         referer = f"{referer_base}/resultadoAdmision"
@@ -1291,7 +1713,7 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
     referer_base = f"{base_url}/buscador-externo/principal"
 
     # Resolver modos seg\u00fan men\u00fa
-    if ambito in ("sentencia", "sentencias"):
+    if ambito in _SEC_SENTENCIAS:
         if "nro_s" in tipo_busqueda or "nro_sen" in tipo_busqueda:
             modo = "numero_sentencia"
         elif "nro_caso" in tipo_busqueda:
@@ -1319,8 +1741,8 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
             modo = "texto"
 
     # Routing por secci\u00f3n y \u00e1mbito
-    if seccion in ("causa", "causas", "sentencias/causas"):
-        if ambito in ("sentencia", "sentencias"):
+    if seccion in _SEC_CAUSAS:
+        if ambito in _SEC_SENTENCIAS:
             body = _build_sentencia_payload(texto, numero, modo, payload)
             url = f"{base_url}/buscador-externo/rest/api/sentencia/100_BUSCR_SNTNCIA"
             referer = f"{referer_base}/resultadoSentencia"
@@ -1332,19 +1754,19 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
             referer = f"{base_url}/buscador-externo/causa/resultado"
             parser = _map_causa_items
             etiqueta = "Causas"
-    elif seccion in ("sentencia", "sentencias"):
+    elif seccion in _SEC_SENTENCIAS:
         body = _build_sentencia_payload(texto, numero, modo, payload)
         url = f"{base_url}/buscador-externo/rest/api/sentencia/100_BUSCR_SNTNCIA"
         referer = f"{referer_base}/resultadoSentencia"
         parser = _map_sentencia_items
         etiqueta = "Sentencias"
-    elif seccion in ("seleccion_autos", "autos_seleccion", "autos"):
+    elif seccion in _SEC_AUTOS:
         body = _build_seleccion_payload("autos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
         parser = lambda items: _map_seleccion_items(items, "Autos de selecci\u00f3n")
         etiqueta = "Selecci\u00f3n - Autos"
-    elif seccion in ("seleccion_casos", "casos_ingresados", "seleccion"):
+    elif seccion in _SEC_SELECCION:
         body = _build_seleccion_payload("casos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
@@ -1374,7 +1796,7 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
 def consultar_juriscopio(payload: Dict[str, Any]) -> Dict[str, Any]:
     texto = (payload.get("texto") or payload.get("query") or payload.get("texto_general") or "").strip()
     seccion = (payload.get("seccion") or payload.get("tab") or "causas").lower()
-    if not texto and seccion not in ("admision", "admisión") and not payload.get("numero"):
+    if not texto and seccion not in _SEC_ADMISION and not payload.get("numero"):
         return {"error": "Debe proporcionar un texto o número para la consulta.", "nivel_consulta": "Juriscopio"}
     try:
         return _buscar_juriscopio_http(payload)
@@ -1760,7 +2182,7 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
     referer_base = f"{base_url}/buscador-externo/principal"
 
     # Resolver modos segun menu
-    if ambito in ("sentencia", "sentencias"):
+    if ambito in _SEC_SENTENCIAS:
         if "nro_s" in tipo_busqueda or "nro_sen" in tipo_busqueda:
             modo = "numero_sentencia"
         elif "nro_caso" in tipo_busqueda:
@@ -1788,8 +2210,8 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
             modo = "texto"
 
     # Routing
-    if seccion in ("causa", "causas", "sentencias/causas"):
-        if ambito in ("sentencia", "sentencias"):
+    if seccion in _SEC_CAUSAS:
+        if ambito in _SEC_SENTENCIAS:
             body = _build_sentencia_payload(texto, numero, modo, payload)
             url = f"{base_url}/buscador-externo/rest/api/sentencia/100_BUSCR_SNTNCIA"
             referer = f"{referer_base}/resultadoSentencia"
@@ -1801,25 +2223,25 @@ def _buscar_juriscopio_http_v2(payload: Dict[str, Any]) -> Dict[str, Any]:
             referer = f"{base_url}/buscador-externo/causa/resultado"
             parser = _map_causa_items
             etiqueta = "Causas"
-    elif seccion in ("sentencia", "sentencias"):
+    elif seccion in _SEC_SENTENCIAS:
         body = _build_sentencia_payload(texto, numero, modo, payload)
         url = f"{base_url}/buscador-externo/rest/api/sentencia/100_BUSCR_SNTNCIA"
         referer = f"{referer_base}/resultadoSentencia"
         parser = _map_sentencia_items
         etiqueta = "Sentencias"
-    elif seccion in ("seleccion_autos", "autos_seleccion", "autos"):
+    elif seccion in _SEC_AUTOS:
         body = _build_seleccion_payload("autos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
         parser = lambda items: _map_seleccion_items(items, "Autos de seleccion")
         etiqueta = "Seleccion - Autos"
-    elif seccion in ("seleccion_casos", "casos_ingresados", "seleccion"):
+    elif seccion in _SEC_SELECCION:
         body = _build_seleccion_payload("casos", texto, numero, modo, payload)
         url = f"{base_url}/buscador-seleccion/rest/api/seleccion/100_BUSCR_SELECCION"
         referer = f"{referer_base}/resultadoSeleccion"
         parser = lambda items: _map_seleccion_items(items, "Casos ingresados a seleccion")
         etiqueta = "Seleccion - Casos"
-    elif seccion in ("admision", "admision"):
+    elif seccion in _SEC_ADMISION:
         body = _build_admision_payload(texto, numero, "numero" if modo.startswith("numero") else "texto" if modo.startswith("texto") else modo, payload)
         url = f"{base_url}/buscador-admision/rest/api/admision/100_BUSCR_ADMISION"
         referer = f"{referer_base}/resultadoAdmision"
@@ -1846,7 +2268,7 @@ def consultar_juriscopio(payload: Dict[str, Any]) -> Dict[str, Any]:
     texto = (payload.get("texto") or payload.get("query") or payload.get("texto_general") or "").strip()
     seccion = (payload.get("seccion") or payload.get("tab") or "causas").lower()
     numero_directo = payload.get("numero") or payload.get("numero_caso") or payload.get("numSentencia") or ""
-    if not texto and seccion not in ("admision", "admision") and not numero_directo:
+    if not texto and seccion not in _SEC_ADMISION and not numero_directo:
         return {"error": "Debe proporcionar un texto o numero para la consulta.", "nivel_consulta": "Juriscopio"}
 
     try: